@@ -0,0 +1,79 @@
+# approvals.py - persistent approval decisions for the Pending Approvals tab
+import contextlib
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+ACTIONS = ("approve", "pause")
+
+# Publication IDs are per sheet: the same URL can be pending in both sheets.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS approval_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sheet TEXT NOT NULL,
+    publication_id INTEGER NOT NULL,
+    action TEXT NOT NULL CHECK (action IN ('approve', 'pause')),
+    decided_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS approval_events_sheet ON approval_events (sheet, publication_id, id);
+"""
+
+
+class ApprovalStore:
+    """Append-only log of approve / pause decisions in SQLite (WAL mode).
+
+    Every decision is one INSERT, so concurrent reviewers never overwrite
+    each other and nothing is rewritten; the current state of a publication
+    is its latest event. Each call opens its own connection, which makes the
+    store safe to share across Streamlit sessions and threads.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def record(self, sheet, publication_id, action):
+        """Append one decision on ``sheet``'s publication; returns its timestamp."""
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown approval action {action!r}; expected one of {ACTIONS}")
+        decided_at = datetime.now()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO approval_events (sheet, publication_id, action, decided_at) VALUES (?, ?, ?, ?)",
+                (sheet, int(publication_id), action, decided_at.isoformat(timespec="seconds")),
+            )
+        return decided_at
+
+    def latest(self, sheet):
+        """Latest decision per publication of ``sheet``, indexed by publication ID, for joining onto it."""
+        with self._connect() as conn:
+            latest = pd.read_sql_query(
+                "SELECT publication_id, action, decided_at FROM approval_events "
+                "WHERE id IN (SELECT MAX(id) FROM approval_events WHERE sheet = ? GROUP BY publication_id)",
+                conn, params=(sheet,),
+            )
+        latest["decided_at"] = pd.to_datetime(latest["decided_at"])
+        # Not set_index(): pandas 3 tries to turn two large IDs into a RangeIndex and overflows.
+        latest.index = pd.Index(latest.pop("publication_id"))
+        return latest
+
+
+def pending_with_decisions(df, decisions):
+    """Rows still awaiting approval, joined on publication ID with their latest decision.
+
+    Approved rows drop out; paused ones stay, carrying ``action`` and ``decided_at``.
+    """
+    pending = df[df["Approval Date"].isna()].join(decisions, on="Publication ID")
+    return pending[pending["action"] != "approve"]
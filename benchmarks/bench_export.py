@@ -0,0 +1,88 @@
+# benchmarks/bench_export.py - chunked exports vs exporting a copy of the selection
+#
+#   python benchmarks/bench_export.py [--sizes 100000 1000000] [--formats csv parquet xlsx]
+#
+#   naive   : df.iloc[rows][cols].to_csv() / .to_parquet() / .to_excel() into memory,
+#             what a download button fed with the filtered frame would do
+#   chunked : exports.export_file(), EXPORT_CHUNK_ROWS rows at a time into a temp file
+#
+# Every row of the main sheet is exported. "peak MiB" is the memory a run adds
+# beyond the output file itself (the resident high-water mark on Linux, see
+# bench_suite.py), i.e. the working memory each approach needs. Each run gets its
+# own process, with the allocators trimmed first, so no run reuses another's heap.
+import argparse
+import ctypes
+import io
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_suite import measure  # noqa: E402
+from catalog import CATEGORY_FIELDS, TABLE_COLUMNS  # noqa: E402
+from exports import XLSX_MAX_ROWS, export_columns, export_file  # noqa: E402
+from preprocess import compact, prepare  # noqa: E402
+from synthetic import make_main  # noqa: E402
+
+
+def naive(fmt, df, rows, cols):
+    out = io.BytesIO()
+    selection = df.iloc[rows][cols]
+    if fmt == "csv":
+        out.write(selection.to_csv(index=False).encode("utf-8"))
+    elif fmt == "parquet":
+        selection.to_parquet(out, index=False)
+    else:
+        selection.to_excel(out, index=False)
+    return out
+
+
+def size(out):
+    return out.seek(0, os.SEEK_END)
+
+
+def worker(n, fmt, path):
+    """One export in a fresh process; prints ``[rows, seconds, file MiB, working MiB]`` as JSON."""
+    import pyarrow as pa
+
+    df = compact(prepare(make_main(n)), CATEGORY_FIELDS["main"])  # the catalog frame, without its indexes
+    rows, cols = np.arange(min(n, XLSX_MAX_ROWS) if fmt == "xlsx" else n), TABLE_COLUMNS["main"]
+    pa.default_memory_pool().release_unused()
+    ctypes.CDLL("libc.so.6").malloc_trim(0)
+    if path == "naive":
+        seconds, peak, out = measure(lambda: naive(fmt, df, rows, export_columns(cols)), 1)
+    else:
+        seconds, peak, out = measure(lambda: export_file(fmt, df, rows, cols), 1)
+    file_mib = size(out) / 2**20
+    # The naive output lives in memory, the chunked one on disk until it is served.
+    working = peak / 2**20 - (file_mib if path == "naive" else 0)
+    print(json.dumps([len(rows), seconds, file_mib, working]))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--formats", nargs="+", default=["csv", "parquet", "xlsx"])
+    parser.add_argument("--worker", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        n, fmt, path = args.worker
+        worker(int(n), fmt, path)
+        return
+
+    print(f"{'rows':>9} {'format':<8} {'path':<8} {'seconds':>8} {'file MiB':>9} {'peak MiB':>9}")
+    for n in args.sizes:
+        for fmt in args.formats:
+            for path in ["naive", "chunked"]:
+                out = subprocess.run([sys.executable, __file__, "--worker", str(n), fmt, path],
+                                     check=True, capture_output=True, text=True).stdout
+                rows, seconds, file_mib, working = json.loads(out.splitlines()[-1])
+                print(f"{rows:>9} {fmt:<8} {path:<8} {seconds:>8.2f} {file_mib:>9.1f} {working:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# benchmarks/bench_fetch.py - two-call vs single-workbook sheet loading
+#
+#   python benchmarks/bench_fetch.py              # offline: serves data/database.xlsx locally
+#   python benchmarks/bench_fetch.py --live       # against the real Google Sheets export
+#
+# Reports wall time and peak Python heap (tracemalloc) for:
+#   two-call : the original load_data() path, pd.read_excel() once per gid URL
+#   workbook : GoogleSheetsSource, one download + one parse of the used sheets/columns
+import argparse
+import functools
+import http.server
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config  # noqa: E402
+from data_source import EXCEL_ENGINE, GoogleSheetsSource  # noqa: E402
+
+
+def serve_workbook(path):
+    """Serve ``path`` over HTTP on localhost; returns its URL."""
+    class Handler(http.server.SimpleHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    handler = functools.partial(Handler, directory=os.path.dirname(path))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}/{os.path.basename(path)}"
+
+
+def measure(fn, repeat):
+    """Median wall time over ``repeat`` runs, then peak heap of one traced run."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(times), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--live", action="store_true", help="fetch the real Google Sheets export")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.live:
+        workbook_url = config.SHEET_URL
+        two_call_urls = [workbook_url + "&gid=0", workbook_url + "&gid=536512581"]
+        sheets = {"main": config.SHEET_MAIN, "comp": config.SHEET_COMP}
+        header = 0
+    else:
+        workbook_url = serve_workbook(config.XLSX_PATH)
+        two_call_urls = [workbook_url, workbook_url]
+        sheets = {"main": config.XLSX_SHEET_MAIN, "comp": config.XLSX_SHEET_COMP}
+        header = 1
+
+    def two_call():
+        for url in two_call_urls:
+            pd.read_excel(url)
+
+    def workbook():
+        # A fresh source each time so the ETag / hash shortcut never kicks in.
+        GoogleSheetsSource(workbook_url, sheets, header=header).fetch()
+
+    print(f"engine for workbook path: {EXCEL_ENGINE}; repeat={args.repeat}")
+    print(f"{'path':<10} {'median s':>10} {'peak MiB':>10}")
+    for name, fn in [("two-call", two_call), ("workbook", workbook)]:
+        seconds, peak = measure(fn, args.repeat)
+        print(f"{name:<10} {seconds:>10.3f} {peak / 2**20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# benchmarks/bench_memory.py - in-memory size of the publication frames, per 100k rows
+#
+#   python benchmarks/bench_memory.py [--sizes 100000 1000000]
+#
+#   legacy  : the original load_data() frame: fillna("-"), Python-object cells,
+#             formatted date strings, an HTML anchor per row in "Link" and a
+#             <b>-wrapped copy of Topic / Title
+#   typed   : prepare() plus Categorical filter columns, text left as parsed
+#   compact : Catalog.df, what the dashboard now holds once per snapshot
+#
+# Sizes are pandas' deep memory_usage() (Arrow buffers included), scaled to 100k rows.
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_preprocess import format_date_safe  # noqa: E402
+from catalog import FILTER_FIELDS, build_catalogs  # noqa: E402
+from preprocess import LINK_HTML, prepare  # noqa: E402
+from synthetic import make_frames  # noqa: E402
+
+BOLD = {"main": "Topic", "comp": "Title"}
+
+
+def legacy(df, name):
+    df = df.fillna("-").astype(object)
+    for col in ["Approval Date", "Publishing Date"]:
+        df[col] = df[col].apply(format_date_safe)
+    df["Link"] = df["URL"].apply(lambda x: LINK_HTML.format(url=x) if x != "-" else "")
+    df[BOLD[name]] = df[BOLD[name]].apply(lambda x: f"<b>{x}</b>" if x != "-" else x)
+    return df
+
+
+def typed(df, name):
+    df = prepare(df)
+    for col in FILTER_FIELDS[name]:
+        df[col] = pd.Categorical(df[col])
+    return df
+
+
+def mib(df):
+    return df.memory_usage(deep=True).sum() / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'sheet':<5} {'legacy MiB/100k':>16} {'typed MiB/100k':>15} {'compact MiB/100k':>17} {'saved':>6}")
+    for n in args.sizes:
+        frames = make_frames(n)
+        catalogs = build_catalogs({name: raw.copy() for name, raw in frames.items()})
+        for name, raw in frames.items():
+            scale = 100_000 / n
+            sizes = [mib(legacy(raw.copy(), name)), mib(typed(raw.copy(), name)), mib(catalogs[name].df)]
+            legacy_mib, typed_mib, compact_mib = (size * scale for size in sizes)
+            print(f"{n:>9} {name:<5} {legacy_mib:>16.1f} {typed_mib:>15.1f} {compact_mib:>17.1f} {1 - compact_mib / legacy_mib:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/bench_parse.py - untyped read + post-hoc coercion vs the schema-typed read
+#
+#   python benchmarks/bench_parse.py [--sizes 10000 100000] [--repeat 3]
+#
+#   post-hoc : pd.read_excel(usecols=...) of both sheets, then prepare() and
+#              compact() coerce the dates and text, what ingestion used to do
+#   schema   : data_source.read_workbook() + schema.conform(): calamine's cells
+#              typed per column by SCHEMAS, every row validated in the same pass
+#
+# Workbooks are synthetic, in the live sheet layout, with 1% of the date cells
+# replaced by text that is not a date. "bad rows" is what the schema path
+# reports for them (post-hoc coercion turns them into NaT without a word).
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_source import EXCEL_ENGINE, read_workbook  # noqa: E402
+from preprocess import compact, prepare  # noqa: E402
+from schema import SCHEMAS, check_sheet  # noqa: E402
+from synthetic import make_frames  # noqa: E402
+
+SHEETS = {"main": "main", "comp": "comp"}
+
+
+def workbook(rows, bad_share=0.01, seed=0):
+    """xlsx bytes of ``rows`` synthetic rows per sheet, ``bad_share`` of the approval dates garbled."""
+    rng = np.random.default_rng(seed)
+    out = io.BytesIO()
+    with pd.ExcelWriter(out) as writer:
+        for name, df in make_frames(rows, seed=seed).items():
+            df = df.astype({"Approval Date": object})
+            df.loc[rng.random(len(df)) < bad_share, "Approval Date"] = "tbd"
+            df.to_excel(writer, sheet_name=name, index=False)
+    return out.getvalue()
+
+
+def post_hoc(body):
+    with pd.ExcelFile(io.BytesIO(body), engine=EXCEL_ENGINE) as book:
+        return {name: compact(prepare(book.parse(sheet, usecols=lambda c, name=name: c in SCHEMAS[name])))
+                for name, sheet in SHEETS.items()}
+
+
+def schema(body):
+    checked = {name: check_sheet(name, df) for name, df in read_workbook(io.BytesIO(body), SHEETS).items()}
+    return {name: typed for name, (typed, _) in checked.items()}, sum(issues["row"].nunique() for _, issues in checked.values())
+
+
+def median_seconds(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"engine: {EXCEL_ENGINE}")
+    print(f"{'rows':>8} {'post-hoc s':>11} {'schema s':>9} {'speedup':>8} {'bad rows':>9}")
+    for n in args.sizes:
+        body = workbook(n)
+        frames, bad_rows = schema(body)
+        expected = post_hoc(body)
+        for name in frames:  # same values either way
+            pd.testing.assert_frame_equal(frames[name], expected[name][list(SCHEMAS[name])], check_dtype=False)
+        slow, fast = median_seconds(lambda: post_hoc(body), args.repeat), median_seconds(lambda: schema(body), args.repeat)
+        print(f"{n:>8} {slow:>11.2f} {fast:>9.2f} {slow / fast:>7.1f}x {bad_rows:>9}")
+
+
+if __name__ == "__main__":
+    main()
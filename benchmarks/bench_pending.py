@@ -0,0 +1,62 @@
+# benchmarks/bench_pending.py - Pending Approvals rerun time vs number of pending items
+#
+#   python benchmarks/bench_pending.py [--pending 100 1000 5000] [--repeat 3]
+#
+# Each size runs dashboard_new.py headless through Streamlit's AppTest, in its
+# own process (config and st.cache_resource are process-wide), on a synthetic
+# Parquet snapshot where every row is pending. Reported: median rerun time of
+# the Pending Approvals tab and the number of expanders it built.
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def worker(pending, repeat):
+    from streamlit.testing.v1 import AppTest
+
+    from data_source import write_snapshot
+    from synthetic import make_frames
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_snapshot(make_frames(pending, pending=1.0), tmp)
+        os.environ.update(
+            DASHBOARD_DATA_SOURCE="parquet",
+            DASHBOARD_SNAPSHOT_DIR=tmp,
+            DASHBOARD_APPROVALS_DB=os.path.join(tmp, "approvals.db"),
+            DASHBOARD_CACHE_DIR="",
+        )
+        at = AppTest.from_file(os.path.join(ROOT, "dashboard_new.py"), default_timeout=600).run()
+        at.button(key="Pending Approvals").click().run()
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            at.run()
+            times.append(time.perf_counter() - start)
+        print(f"{pending:>9} {statistics.median(times) * 1e3:>10.0f} {len(at.expander):>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pending", type=int, nargs="+", default=[100, 1_000, 5_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        worker(args.worker, args.repeat)
+        return
+    print(f"{'pending':>9} {'rerun ms':>10} {'expanders':>10}")
+    for pending in args.pending:
+        subprocess.run([sys.executable, __file__, "--worker", str(pending), "--repeat", str(args.repeat)],
+                       check=True, stderr=subprocess.DEVNULL)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# benchmarks/bench_preprocess.py - legacy row-wise preprocessing vs the vectorized path
+#
+#   python benchmarks/bench_preprocess.py [--sizes 10000 100000 1000000]
+#
+#   legacy   : the original load_data() body (fillna("-") + per-cell .apply)
+#   prepare  : preprocess.prepare(), what now runs once per snapshot
+#   display  : preprocess.display_frame() over every row, an upper bound for the render step
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from preprocess import display_frame, prepare  # noqa: E402
+from synthetic import make_main  # noqa: E402
+
+MAIN_COLS = ["Sector", "Type", "Approval Date", "Publishing Date", "Topic", "Alpha Idea", "Link"]
+
+
+def format_date_safe(x):
+    if isinstance(x, str) or x == "-" or pd.isna(x):
+        return "-"
+    else:
+        return x.strftime("%b %d, %Y")
+
+
+def legacy(df):
+    df = df.fillna("-")  # pandas 3 refuses the in-place, dtype-changing form
+    df["Approval Date"] = df["Approval Date"].apply(format_date_safe)
+    df["Publishing Date"] = df["Publishing Date"].apply(format_date_safe)
+    df["Link"] = df["URL"].apply(lambda x: f'<a href="{x}" target="_blank" style= "text-decoration: none !important;">🔗</a>' if x != "-" else "")
+    df["Topic"] = df["Topic"].apply(lambda x: f"<b>{x}</b>" if x != "-" else x)
+    return df
+
+
+def timed(fn, df):
+    start = time.perf_counter()
+    out = fn(df)
+    return time.perf_counter() - start, out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'legacy s':>10} {'prepare s':>10} {'display s':>10} {'speedup':>8}")
+    for n in args.sizes:
+        raw = make_main(n)
+        legacy_s, _ = timed(legacy, raw.copy())
+        prepare_s, prepared = timed(prepare, raw.copy())
+        display_s, _ = timed(lambda df: display_frame(df, MAIN_COLS), prepared)
+        speedup = legacy_s / (prepare_s + display_s)
+        print(f"{n:>9} {legacy_s:>10.3f} {prepare_s:>10.3f} {display_s:>10.3f} {speedup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
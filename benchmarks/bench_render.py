@@ -0,0 +1,47 @@
+# benchmarks/bench_render.py - payload size and render time, full table vs one page
+#
+#   python benchmarks/bench_render.py [--sizes 1000 10000 100000] [--page-size 50] [--full-max 100000]
+#
+#   full : the previous path, display strings + to_html() for every filtered row
+#   page : display strings + to_html() for the visible page only
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from catalog import build_catalogs  # noqa: E402
+from preprocess import display_frame  # noqa: E402
+from render import page_rows, table_html  # noqa: E402
+from synthetic import make_frames  # noqa: E402
+
+MAIN_COLS = ["Sector", "Type", "Approval Date", "Publishing Date", "Topic", "Alpha Idea", "Link"]
+
+
+def render(catalog, rows):
+    start = time.perf_counter()
+    html = table_html(display_frame(catalog.df.iloc[rows], MAIN_COLS))
+    return time.perf_counter() - start, len(html.encode())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--full-max", type=int, default=100_000, help="skip the full render above this size")
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'full ms':>9} {'full KiB':>10} {'page ms':>8} {'page KiB':>9}")
+    for n in args.sizes:
+        catalog = build_catalogs({"main": make_frames(n)["main"]})["main"]
+        rows = catalog.select()
+        full_ms = full_kib = "-"
+        if n <= args.full_max:
+            seconds, size = render(catalog, rows)
+            full_ms, full_kib = f"{seconds * 1e3:.1f}", f"{size / 1024:.0f}"
+        seconds, size = render(catalog, page_rows(rows, 1, args.page_size))
+        print(f"{n:>9} {full_ms:>9} {full_kib:>10} {seconds * 1e3:>8.1f} {size / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
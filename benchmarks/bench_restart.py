@@ -0,0 +1,114 @@
+# benchmarks/bench_restart.py - startup-to-first-render with and without the persisted snapshot
+#
+#   python benchmarks/bench_restart.py [--rows 300 10000] [--latency 1.5] [--restarts 3]
+#
+# Serves a synthetic workbook (live sheet layout) from a local HTTP server that
+# waits --latency seconds before answering, like the Google Sheets export. Each
+# "restart" is a fresh process running dashboard_new.py through AppTest with
+# DASHBOARD_CACHE_DIR set:
+#
+#   cold : empty cache directory, the first render waits for download + parse
+#   warm : the directory a previous process left behind; the first render maps
+#          the persisted sheets and the refresher revalidates in the background
+#
+# "snapshot ms" is until the SheetCache serves a snapshot (resources.get_sheet_cache(),
+# which the page calls first), "first render ms" adds the first AppTest run of the
+# page on top; "revalidated" is what the background revalidation of a warm start
+# found (a 304 is "unchanged": no download, no parse).
+import argparse
+import functools
+import http.server
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from demo_shared_cache import write_workbook  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def serve_slow(path, latency):
+    """Serve ``path`` on localhost after ``latency`` seconds per request; returns its URL."""
+
+    class Handler(http.server.SimpleHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            super().do_GET()  # answers If-Modified-Since with 304
+
+        def log_message(self, *args):
+            pass
+
+    handler = functools.partial(Handler, directory=os.path.dirname(path))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}/{os.path.basename(path)}"
+
+
+def worker():
+    """One restart: snapshot, first AppTest run, then the background revalidation; prints JSON."""
+    from streamlit.testing.v1 import AppTest
+
+    import resources
+
+    at = AppTest.from_file(os.path.join(ROOT, "dashboard_new.py"), default_timeout=120)
+    start = time.perf_counter()
+    cache = resources.get_sheet_cache()  # the same process-wide resource the page gets
+    cache.snapshot()
+    ready = time.perf_counter() - start
+    at.run()
+    first_render = time.perf_counter() - start
+    assert not at.exception, at.exception
+    while cache.hits + cache.misses < 1:  # warm start: the refresher was woken at start()
+        time.sleep(0.05)
+    print(json.dumps({"ready": ready, "first_render": first_render, "hits": cache.hits, "misses": cache.misses}))
+
+
+def restart(url, cache_dir, env_timeout=120):
+    env = dict(
+        os.environ, DASHBOARD_DATA_SOURCE="gsheets", DASHBOARD_SHEET_URL=url, DASHBOARD_SHEET_MAIN="main",
+        DASHBOARD_SHEET_COMP="comp", DASHBOARD_CACHE_DIR=cache_dir, DASHBOARD_SHARED_CACHE_DIR="",
+    )
+    out = subprocess.run([sys.executable, __file__, "--worker"], env=env, check=True,
+                         capture_output=True, text=True, timeout=env_timeout).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[300, 10_000])
+    parser.add_argument("--latency", type=float, default=1.5)
+    parser.add_argument("--restarts", type=int, default=3)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker()
+        return
+
+    print(f"{'rows':>7} {'start':<5} {'snapshot ms':>12} {'first render ms':>16}  revalidated")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as site, tempfile.TemporaryDirectory() as scratch:
+            workbook = os.path.join(site, "export.xlsx")
+            write_workbook(workbook, rows, seed=0)
+            url = serve_slow(workbook, args.latency)
+            cache_dir = os.path.join(scratch, "cache")
+            for kind in ["cold", "warm"]:
+                results = []
+                for _ in range(args.restarts):
+                    if kind == "cold":
+                        shutil.rmtree(cache_dir, ignore_errors=True)
+                    results.append(restart(url, cache_dir))
+                ready, first = (statistics.median(r[key] for r in results) * 1e3 for key in ["ready", "first_render"])
+                found = "unchanged" if all(r["hits"] for r in results) else "downloaded"
+                print(f"{rows:>7} {kind:<5} {ready:>12.0f} {first:>16.0f}  {found if kind == 'warm' else '-'}")
+
+
+if __name__ == "__main__":
+    main()
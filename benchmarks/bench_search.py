@@ -0,0 +1,100 @@
+# benchmarks/bench_search.py - row-wise apply search vs the inverted index
+#
+#   python benchmarks/bench_search.py [--sizes 10000 100000] [--legacy-max 100000]
+#
+#   legacy : the original filter_df(), a row-wise .apply over the HTML-formatted frame
+#   index  : Catalog.search_mask() on the prebuilt SearchIndex (median of --repeat runs)
+#   ranked : Catalog.rank() of those hits, best BM25 match first (quoted queries are phrases)
+#   page   : Catalog.rank() of only the first page of them, as the dashboard shows
+#   typing : every keystroke of TYPED, searched from scratch vs narrowed from the
+#            previous keystroke's mask (only the terms it didn't hold are searched)
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_preprocess import legacy  # noqa: E402
+from catalog import build_catalogs  # noqa: E402
+from render import PAGE_SIZES  # noqa: E402
+from search import extra_terms  # noqa: E402
+from synthetic import make_frames  # noqa: E402
+
+QUERIES = ["nuclear", "nuc", "energy storage", '"energy storage"', '"nuclear energ"*', "a", "veev", "zzz"]
+TYPED = "nuclear energy"
+
+
+def legacy_search(df, term):
+    return df[df.apply(lambda row: row.astype(str).str.contains(term, case=False).any(), axis=1)]
+
+
+def median_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1e3
+
+
+def typing(catalog, repeat):
+    """Per keystroke: ``(query, hits, scratch ms, narrowed ms)``; narrowing must agree with scratch."""
+    results, previous, previous_mask = [], None, None
+    for end in range(1, len(TYPED) + 1):
+        query = TYPED[:end]
+        if query.endswith(" "):
+            continue
+        mask = catalog.search_mask(query)
+        scratch_ms = median_ms(lambda: catalog.search_mask(query), repeat)
+        narrowed_ms = None
+        if previous is not None:
+            extra = extra_terms(query, previous)
+            narrow = lambda: previous_mask & catalog.search_mask(extra) if extra else previous_mask  # noqa: E731
+            assert np.array_equal(mask, narrow()), query
+            narrowed_ms = median_ms(narrow, repeat)
+        results.append((query, int(mask.sum()), scratch_ms, narrowed_ms))
+        previous, previous_mask = query, mask
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--legacy-max", type=int, default=100_000, help="skip the slow legacy path above this size")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'query':<18} {'hits':>7} {'legacy ms':>10} {'index ms':>9} {'ranked ms':>10} {'page ms':>8}")
+    for n in args.sizes:
+        frames = make_frames(n)
+        start = time.perf_counter()
+        catalog = build_catalogs({"main": frames["main"].copy()})["main"]
+        print(f"{n:>9} {'(index build)':<18} {'':>7} {'':>10} {(time.perf_counter() - start) * 1e3:>9.1f}")
+        legacy_frame = legacy(frames["main"].copy()) if n <= args.legacy_max else None
+
+        for term in QUERIES:
+            times = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                mask = catalog.search_mask(term)
+                times.append(time.perf_counter() - start)
+            rows = catalog.rows(mask)
+            ranked_ms = median_ms(lambda: catalog.rank(rows, term), max(1, args.repeat // 10))
+            page_ms = median_ms(lambda: catalog.rank(rows, term, limit=PAGE_SIZES[0]), max(1, args.repeat // 10))
+            legacy_ms = "-"
+            if legacy_frame is not None and term == QUERIES[0]:
+                start = time.perf_counter()
+                legacy_search(legacy_frame, term)
+                legacy_ms = f"{(time.perf_counter() - start) * 1e3:.1f}"
+            print(f"{n:>9} {term:<18} {len(rows):>7} {legacy_ms:>10} {statistics.median(times) * 1e3:>9.3f} {ranked_ms:>10.3f} {page_ms:>8.3f}")
+
+        print(f"{'rows':>9} {'typed':<18} {'hits':>7} {'scratch ms':>10} {'narrowed ms':>12}")
+        for query, hits, scratch_ms, narrowed_ms in typing(catalog, args.repeat):
+            narrowed = "-" if narrowed_ms is None else f"{narrowed_ms:.3f}"
+            print(f"{n:>9} {query!r:<18} {hits:>7} {scratch_ms:>10.3f} {narrowed:>12}")
+
+
+if __name__ == "__main__":
+    main()
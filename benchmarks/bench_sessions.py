@@ -0,0 +1,105 @@
+# benchmarks/bench_sessions.py - process RSS vs number of concurrent sessions (AppTest load test)
+#
+#   python benchmarks/bench_sessions.py [--rows 100000] [--sessions 1 10 25 50 100]
+#
+# One process serves every session, like a Streamlit server: the snapshot and
+# the other st.cache_resource objects are shared, each AppTest is one browser
+# session with its own st.session_state. Sessions are added until each count in
+# --sessions is reached; every new session loads the page, types a query one
+# keystroke at a time, picks a filter and moves to page 2, then stays open.
+#
+# Reported per count: resident set size (allocators trimmed first), the growth
+# per session added since the previous count, and the st.session_state bytes
+# one session holds (NumPy arrays and strings, see state_bytes). The snapshot
+# itself is paid once, so RSS grows far slower than sessions x snapshot size.
+import argparse
+import ctypes
+import gc
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from data_source import write_snapshot  # noqa: E402
+from synthetic import make_frames  # noqa: E402
+
+QUERIES = ["cloud storage", "clinical", "margin expansion", "capital pipeline", "revenue", "approval focus"]
+
+
+def rss_mib():
+    from bench_suite import _status_kib  # imports config, so only after the environment is set
+
+    gc.collect()
+    ctypes.CDLL("libc.so.6").malloc_trim(0)
+    return _status_kib("VmRSS") / 1024
+
+
+def state_bytes(value):
+    """Bytes held by a session-state value: array buffers and strings, walked through containers."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(state_bytes(k) + state_bytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sum(state_bytes(v) for v in value)
+    return 8
+
+
+def session(script, i):
+    """One simulated user: search while typing, filter, page; returns the still-open AppTest."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(script, default_timeout=120).run()
+    query = QUERIES[i % len(QUERIES)]
+    for end in range(1, len(query) + 1):
+        at.text_input(key="search_term").input(query[:end]).run()
+    sectors = at.multiselect(key="sector_filter")
+    sectors.select(sectors.options[i % len(sectors.options)]).run()
+    if at.number_input(key="main_page").max > 1:
+        at.number_input(key="main_page").increment().run()
+    assert not at.exception, at.exception
+    return at
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 25, 50, 100])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_snapshot(make_frames(args.rows), tmp)
+        os.environ.update(
+            DASHBOARD_DATA_SOURCE="parquet", DASHBOARD_SNAPSHOT_DIR=tmp, DASHBOARD_CACHE_DIR="",
+            DASHBOARD_APPROVALS_DB=os.path.join(tmp, "approvals.db"),
+        )
+        import resources  # reads config, so only after the environment is set
+
+        script = os.path.join(ROOT, "dashboard_new.py")
+        base = rss_mib()
+        catalogs = resources.get_sheet_cache().get()
+        snapshot = sum(c.df.memory_usage(deep=True).sum() for c in catalogs.values()) / 2**20
+        print(f"{args.rows:,} rows per sheet; snapshot frames {snapshot:.1f} MiB, process {rss_mib() - base:+.1f} MiB once loaded")
+        print(f"{'sessions':>8} {'RSS MiB':>8} {'KiB/session added':>18} {'state KiB/session':>18} {'s/session':>10}")
+
+        sessions, previous = [], None
+        for count in args.sessions:
+            start = time.perf_counter()
+            while len(sessions) < count:
+                sessions.append(session(script, len(sessions)))
+            seconds = (time.perf_counter() - start) / max(1, count - (previous[0] if previous else 0))
+            rss = rss_mib()
+            state = np.mean([state_bytes(at._session_state.filtered_state) for at in sessions]) / 1024
+            added = "-" if previous is None else f"{(rss - previous[1]) * 1024 / (count - previous[0]):.0f}"
+            print(f"{count:>8} {rss:>8.1f} {added:>18} {state:>18.1f} {seconds:>10.2f}")
+            previous = (count, rss)
+
+
+if __name__ == "__main__":
+    main()
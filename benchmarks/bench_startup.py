@@ -0,0 +1,87 @@
+# benchmarks/bench_startup.py - cold import time and per-rerun script time of the dashboards
+#
+#   python benchmarks/bench_startup.py [--repeat 5] [--reruns 20] [dashboard_new.py ...]
+#
+#   imports : the script's top-level import statements in a fresh interpreter,
+#             summed from ``python -X importtime`` (median of --repeat), plus the
+#             heaviest top-level packages by cumulative time
+#   cold    : first AppTest run of the script (caches empty, data loaded from xlsx)
+#   rerun   : median AppTest rerun per tab once the shared caches are warm
+import argparse
+import ast
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TABS = ["Progressive Industries", "PartnerCap Equity Research", "Pending Approvals"]
+
+
+def import_block(script):
+    """Source of the top-level ``import`` / ``from`` statements of ``script``."""
+    with open(os.path.join(ROOT, script)) as f:
+        tree = ast.parse(f.read())
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def import_time(script, repeat):
+    """Median total import ms, and ``[(package, cumulative ms)]`` of the slowest run's top level."""
+    totals, heaviest = [], []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", import_block(script)],
+                                cwd=ROOT, capture_output=True, text=True, check=True)
+        total, top = 0, []
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            total += int(self_us)
+            if not name.startswith("  "):  # depth 0: imported by the script itself
+                top.append((name.strip(), int(cumulative_us) / 1e3))
+        totals.append(total / 1e3)
+        heaviest = sorted(top, key=lambda item: -item[1])[:5]
+    return statistics.median(totals), heaviest
+
+
+def rerun_times(script, reruns):
+    from streamlit.testing.v1 import AppTest
+
+    start = time.perf_counter()
+    at = AppTest.from_file(os.path.join(ROOT, script), default_timeout=120).run()
+    cold = time.perf_counter() - start
+    per_tab = {}
+    for tab in TABS if script == "dashboard_new.py" else [None]:
+        if tab is not None:
+            at.button(key=tab).click().run()
+        times = []
+        for _ in range(reruns):
+            start = time.perf_counter()
+            at.run()
+            times.append(time.perf_counter() - start)
+        per_tab[tab or "(default)"] = statistics.median(times)
+    return cold, per_tab
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("scripts", nargs="*", default=["dashboard_new.py", "dashboard.py"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--reruns", type=int, default=20)
+    args = parser.parse_args()
+    os.environ.setdefault("DASHBOARD_DATA_SOURCE", "xlsx")
+    os.environ.setdefault("DASHBOARD_CACHE_DIR", "")  # cold means cold (see bench_restart.py)
+    sys.path.insert(0, ROOT)
+
+    for script in args.scripts:
+        total, heaviest = import_time(script, args.repeat)
+        print(f"{script}: imports {total:.0f} ms  (" + ", ".join(f"{name} {ms:.0f}" for name, ms in heaviest) + ")")
+        cold, per_tab = rerun_times(script, args.reruns)
+        print(f"{script}: cold run {cold * 1e3:.0f} ms")
+        for tab, seconds in per_tab.items():
+            print(f"{script}: rerun {tab:<28} {seconds * 1e3:>7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
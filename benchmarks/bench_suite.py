@@ -0,0 +1,167 @@
+# benchmarks/bench_suite.py - headless per-stage time and peak memory of the dashboard data path
+#
+#   python benchmarks/bench_suite.py [--sizes 10000 100000 1000000] [--repeat 3] [--json out.json]
+#   python benchmarks/bench_suite.py --compare baseline.json   # flag stages that got slower
+#
+# Runs the same functions dashboard_new.py calls, once against data/database.xlsx
+# and once per synthetic size (written to a Parquet snapshot first, so "load" is a
+# real read):
+#
+#   load    : source.fetch(), the raw sheets
+#   build   : build_catalogs(), date parsing + publication IDs + search / filter indexes
+#   filter  : Catalog.select() for two Sector values and one Type
+#   search  : Catalog.select() for a keyword
+#   format  : display_frame() over every filtered row (the old format_date_safe pass)
+#   render  : table_html() of the first page, what a rerun actually ships
+#
+# Time is the median of --repeat runs. Peak is the memory a stage adds on top of
+# what was resident when it started: the kernel's resident high-water mark on
+# Linux (reset before every run, no overhead), elsewhere the tracemalloc peak of
+# one extra traced run. Tracing cannot handle 1M rows within a few GB, RSS can.
+# Each dataset runs in its own process.
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config  # noqa: E402
+from catalog import TABLE_COLUMNS, build_catalogs  # noqa: E402
+from data_source import LocalXlsxSource, ParquetSnapshotSource, write_snapshot  # noqa: E402
+from preprocess import display_frame  # noqa: E402
+from render import page_rows, table_html  # noqa: E402
+from synthetic import make_frames  # noqa: E402
+
+XLSX = "database.xlsx"
+QUERY = "energy"
+PAGE_SIZE = 50
+SLOWER = 1.5  # --compare flags stages at least this much slower than the baseline
+
+
+def _status_kib(field):
+    with open("/proc/self/status") as f:
+        return int(re.search(rf"{field}:\s+(\d+)", f.read()).group(1))
+
+
+def _reset_peak():
+    """Reset the kernel's resident high-water mark (Linux); returns the current RSS in bytes."""
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+    return _status_kib("VmRSS") * 1024
+
+
+try:
+    _reset_peak()
+    PEAK_METHOD = "rss"
+except OSError:
+    PEAK_METHOD = "tracemalloc"
+
+
+def measure(fn, repeat):
+    """Median seconds, peak bytes allocated by the stage, and the stage's output."""
+    times, peak, out = [], 0, None
+    for _ in range(repeat):
+        out = None  # at most one result alive at a time
+        if PEAK_METHOD == "rss":
+            base = _reset_peak()
+        start = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - start)
+        if PEAK_METHOD == "rss":
+            peak = max(peak, _status_kib("VmHWM") * 1024 - base)
+    if PEAK_METHOD == "tracemalloc":
+        out = None
+        tracemalloc.start()
+        out = fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return statistics.median(times), peak, out
+
+
+def run_dataset(new_source, repeat):
+    """Stage results for one dataset; ``new_source()`` returns a fresh source so every load reads."""
+    results = {}
+
+    def stage(name, fn):
+        seconds, peak, out = measure(fn, repeat)
+        results[name] = {"seconds": seconds, "peak_bytes": peak}
+        return out
+
+    frames = stage("load", lambda: new_source().fetch())
+    catalogs = stage("build", lambda: build_catalogs(frames))
+    del frames
+    catalog = catalogs["main"]
+    selections = {"Sector": catalog.options["Sector"][:2], "Type": catalog.options["Type"][:1]}
+    rows = stage("filter", lambda: catalog.select(selections))
+    stage("search", lambda: catalog.select({}, QUERY))
+    stage("format", lambda: display_frame(catalog.df.iloc[rows], TABLE_COLUMNS["main"]))
+    stage("render", lambda: table_html(display_frame(catalog.df.iloc[page_rows(rows, 1, PAGE_SIZE)], TABLE_COLUMNS["main"])))
+    return {"rows": len(catalog.order), "stages": results}
+
+
+def worker(dataset, repeat):
+    """One dataset in its own process, so a 1M-row run starts from a clean heap; prints JSON."""
+    if dataset == XLSX:
+        sheets = {"main": config.XLSX_SHEET_MAIN, "comp": config.XLSX_SHEET_COMP}
+        result = run_dataset(lambda: LocalXlsxSource(config.XLSX_PATH, sheets), repeat)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            write_snapshot(make_frames(int(dataset)), directory)
+            result = run_dataset(lambda: ParquetSnapshotSource(directory), repeat)
+    print(json.dumps(result))
+
+
+def compare(report, baseline):
+    """Lines for every stage at least SLOWER times the baseline's time."""
+    lines = []
+    for label, entry in report.items():
+        for name, result in entry["stages"].items():
+            before = baseline.get(label, {}).get("stages", {}).get(name)
+            if before and result["seconds"] >= SLOWER * before["seconds"]:
+                lines.append(f"{label} / {name}: {before['seconds'] * 1e3:.1f} ms -> {result['seconds'] * 1e3:.1f} ms")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="*", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", help="baseline JSON from an earlier --json run; exits 1 on a regression")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        worker(args.worker, args.repeat)
+        return
+
+    report = {}
+    print(f"peak memory: {PEAK_METHOD}")
+    print(f"{'dataset':<18} {'rows':>9} {'stage':<7} {'ms':>10} {'peak MiB':>9}")
+    for dataset in [XLSX] + [str(n) for n in args.sizes]:
+        out = subprocess.run([sys.executable, __file__, "--worker", dataset, "--repeat", str(args.repeat)],
+                             check=True, capture_output=True, text=True).stdout
+        label = dataset if dataset == XLSX else f"synthetic {dataset}"
+        report[label] = entry = json.loads(out.splitlines()[-1])
+        for name, result in entry["stages"].items():
+            print(f"{label:<18} {entry['rows']:>9} {name:<7} {result['seconds'] * 1e3:>10.2f} {result['peak_bytes'] / 2**20:>9.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f))
+        for line in regressions:
+            print("slower:", line)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
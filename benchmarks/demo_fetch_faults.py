@@ -0,0 +1,145 @@
+# benchmarks/demo_fetch_faults.py - the live-sheet fetcher against a misbehaving local server
+#
+#   python benchmarks/demo_fetch_faults.py [--rows 2000]
+#
+# Serves a synthetic workbook (live sheet layout) from a local HTTP server that
+# can be told to answer slowly, fail with 503 / 404, or fail a few times before
+# recovering, or serve a workbook whose dates are garbled in half the rows
+# (rejected by the schema check). A SheetCache over GoogleSheetsSource goes
+# through each mode; every line shows the requests the server saw, the time
+# the refresh took, the snapshot version served and whether it is flagged stale. Finally the same
+# faults are replayed through AppTest to show the header flag and the error
+# shown when there is no snapshot at all.
+import argparse
+import functools
+import http.server
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from catalog import build_catalogs  # noqa: E402
+from data_source import GoogleSheetsSource, SheetCache  # noqa: E402
+from bench_parse import workbook as garbled_workbook  # noqa: E402
+from demo_shared_cache import write_workbook  # noqa: E402
+
+TIMEOUT, RETRIES, BACKOFF = 1.0, 2, 0.2
+
+
+def serve_faulty(path):
+    """Serve ``path`` on localhost; returns its URL, the mode dict to steer it and the request log."""
+    state = {"mode": "ok", "failures": 0}
+    log = []
+
+    class Handler(http.server.SimpleHTTPRequestHandler):
+        def do_GET(self):
+            log.append(state["mode"])
+            mode = state["mode"]
+            if mode == "flaky" and state["failures"] > 0:
+                state["failures"] -= 1
+                mode = "error"
+            if mode == "slow":
+                time.sleep(TIMEOUT * 2)
+            if mode == "error":
+                self.send_error(503)
+            elif mode == "missing":
+                self.send_error(404)
+            else:
+                super().do_GET()
+
+        def log_message(self, *args):
+            pass
+
+    class Server(http.server.ThreadingHTTPServer):
+        def handle_error(self, request, client_address):
+            pass  # a client that timed out hung up on the slow answer
+
+    handler = functools.partial(Handler, directory=os.path.dirname(path))
+    server = Server(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}/{os.path.basename(path)}", state, log
+
+
+def refresh(cache):
+    """One revalidation, as the background refresher would run it; returns seconds taken."""
+    cache.invalidate()
+    start = time.perf_counter()
+    cache._refresh()
+    return time.perf_counter() - start
+
+
+def sheet_cache_demo(url, state, log, workbook, rows):
+    source = GoogleSheetsSource(url, {"main": "main", "comp": "comp"}, timeout=TIMEOUT, retries=RETRIES, backoff=BACKOFF)
+    cache = SheetCache(source, build_catalogs, ttl=600)
+    print(f"{'mode':<22} {'requests':>8} {'seconds':>8} {'version':>8}  stale")
+    steps = [
+        ("ok", None), ("flaky (2 x 503)", 2), ("slow (2x timeout)", None),
+        ("error (503)", None), ("missing (404)", None), ("ok, workbook garbled", None),
+        ("ok, workbook changed", None),
+    ]
+    for label, failures in steps:
+        state["mode"] = label.split(" ")[0].rstrip(",")
+        state["failures"] = failures or 0
+        if label.startswith("ok, workbook garbled"):
+            with open(workbook, "wb") as f:
+                f.write(garbled_workbook(rows, bad_share=0.5))
+        elif label.startswith("ok, workbook"):
+            write_workbook(workbook, rows + 10, seed=1)
+        before = len(log)
+        seconds = refresh(cache)
+        stale = f"yes ({cache.error})" if cache.failed_at else "no"
+        print(f"{label:<22} {len(log) - before:>8} {seconds:>8.2f} {cache.snapshot().version:>8}  {stale}")
+
+
+def app_demo(url, state):
+    os.environ.update(
+        DASHBOARD_DATA_SOURCE="gsheets", DASHBOARD_SHEET_URL=url, DASHBOARD_SHEET_MAIN="main", DASHBOARD_SHEET_COMP="comp",
+        DASHBOARD_FETCH_TIMEOUT=str(TIMEOUT), DASHBOARD_FETCH_RETRIES=str(RETRIES), DASHBOARD_FETCH_BACKOFF=str(BACKOFF),
+        DASHBOARD_CACHE_DIR="",
+    )
+    from streamlit.testing.v1 import AppTest
+
+    import resources  # reads config, so only after the environment is set
+
+    script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dashboard_new.py")
+
+    def header(at):
+        text = next((m.value for m in at.markdown if "Last updated" in m.value), "")
+        return text[text.index("Last updated"):].split("</small>")[0] if text else f"errors: {[e.value for e in at.error]}"
+
+    state["mode"] = "error"
+    print("app, server down at start :", header(AppTest.from_file(script, default_timeout=60).run()))
+    state["mode"] = "ok"
+    at = AppTest.from_file(script, default_timeout=60).run()
+    print("app, server up            :", header(at))
+    state["mode"] = "error"
+    cache = resources.get_sheet_cache()
+    cache.invalidate()
+    while cache.failed_at is None:  # the background refresher retries, then gives up
+        time.sleep(0.1)
+    print("app, refresh failed       :", header(at.run()))
+    state["mode"] = "ok"
+    cache.invalidate()
+    while cache.failed_at is not None:
+        time.sleep(0.1)
+    print("app, server back          :", header(at.run()))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as site:
+        workbook = os.path.join(site, "export.xlsx")
+        write_workbook(workbook, args.rows, seed=0)
+        url, state, log = serve_faulty(workbook)
+        sheet_cache_demo(url, state, log, workbook, args.rows)
+        print()
+        app_demo(url, state)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# benchmarks/demo_shared_cache.py - N worker processes, one shared snapshot, one fetch
+#
+#   python benchmarks/demo_shared_cache.py [--workers 8] [--rounds 3]
+#
+# Serves a synthetic workbook (live sheet layout) from a local HTTP server that
+# counts requests, then starts N processes that each build a SheetCache over
+# the same SharedSnapshotSource directory. In every round the workbook is
+# rewritten with new rows, the shared copy's TTL has run out, and all workers
+# ask for a snapshot at the same moment. Expected: one request per round,
+# whatever N is, and every worker on the same new shared version with the same
+# fetch time. A last round deletes the workbook: still one request, and every
+# worker flags its data as stale. Exits non-zero when any of that fails.
+import argparse
+import functools
+import http.server
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from catalog import build_catalogs  # noqa: E402
+from data_source import GoogleSheetsSource, SharedSnapshotSource, SheetCache  # noqa: E402
+from synthetic import make_frames  # noqa: E402
+
+
+TTL = 1  # seconds before the shared copy is revalidated
+
+
+def serve_counting(path):
+    """Serve ``path`` on localhost; returns its URL and a list that grows by one per request."""
+    requests = []
+
+    class Handler(http.server.SimpleHTTPRequestHandler):
+        def do_GET(self):
+            requests.append(time.time())
+            super().do_GET()
+
+        def log_message(self, *args):
+            pass
+
+    handler = functools.partial(Handler, directory=os.path.dirname(path))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}/{os.path.basename(path)}", requests
+
+
+def worker(url, directory, rounds, ttl, barrier, results):
+    source = SharedSnapshotSource(GoogleSheetsSource(url, {"main": "main", "comp": "comp"}), directory, ttl=ttl)
+    cache = SheetCache(source, build_catalogs, ttl=0)
+    for round_ in range(rounds + 1):
+        barrier.wait()  # the workbook has changed (or is gone); everyone asks at once
+        snapshot = cache.snapshot()
+        results.put((source.stamp()["version"], len(snapshot.data["main"].order), snapshot.fetched_at, cache.failed_at is not None))
+        barrier.wait()
+
+
+def write_workbook(path, rows, seed):
+    with pd.ExcelWriter(path) as writer:
+        for name, df in make_frames(rows, seed=seed).items():
+            df.to_excel(writer, sheet_name=name, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--rows", type=int, default=2_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as site, tempfile.TemporaryDirectory() as directory:
+        workbook = os.path.join(site, "export.xlsx")
+        url, requests = serve_counting(workbook)
+        barrier, results = multiprocessing.Barrier(args.workers + 1), multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=worker, args=(url, directory, args.rounds, TTL, barrier, results))
+                     for _ in range(args.workers)]
+        for process in processes:
+            process.start()
+
+        print(f"{args.workers} workers")
+        failures = []
+        for round_ in range(args.rounds + 1):
+            failing = round_ == args.rounds
+            before = len(requests)
+            if failing:
+                os.remove(workbook)
+            else:
+                write_workbook(workbook, args.rows + round_, seed=round_)
+            time.sleep(TTL)  # let the shared copy expire
+            barrier.wait()
+            barrier.wait()
+            seen = [results.get(timeout=120) for _ in range(args.workers)]
+            versions = sorted({version for version, _, _, _ in seen})
+            fetched = {fetched_at for _, _, fetched_at, _ in seen}
+            stale = sum(failed for _, _, _, failed in seen)
+            print(f"round {round_}{' (source failing)' if failing else ''}: {len(requests) - before} request(s) "
+                  f"to the source, workers on shared version(s) {versions} with {seen[0][1]} main rows, "
+                  f"{len(fetched)} fetch time(s), {stale} flagged stale")
+            if len(requests) - before != 1:
+                failures.append(f"round {round_}: {len(requests) - before} requests to the source, expected 1")
+            if len(versions) != 1 or len(fetched) != 1:
+                failures.append(f"round {round_}: workers disagree on the snapshot")
+            if stale != (args.workers if failing else 0):
+                failures.append(f"round {round_}: {stale} of {args.workers} workers flagged stale")
+        for process in processes:
+            process.join()
+    if failures:
+        sys.exit("FAILED\n" + "\n".join(failures))
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
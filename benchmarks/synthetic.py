@@ -0,0 +1,66 @@
+# benchmarks/synthetic.py - synthetic sheets shaped like the parsed Google Sheets exports
+import numpy as np
+import pandas as pd
+
+SECTORS = ["New Capital", "Healthtech", "Cleantech", "Fintech", "Agtech", "Mobility",
+           "Space", "Cybersecurity", "Digital Assets", "Frontier Tech"]
+MAIN_TYPES = ["Newsletter", "Deep Dive", "Spotlight", "Webinar"]
+COMP_TYPES = ["Initiation", "Q1FY25", "Q2FY25", "Q3FY25", "Q4FY24", "Update", "Termination"]
+WORDS = ("advanced nuclear sector growth cloud strategy resilience capital deal focus "
+         "platform innovation energy storage battery market expansion margin revenue "
+         "guidance upside catalyst therapy clinical approval launch pipeline").split()
+
+
+def _text(rng, n, words):
+    picks = rng.choice(np.array(WORDS, dtype=object), size=(n, words))
+    return pd.Series([" ".join(row) for row in picks], dtype=object).str.upper()
+
+
+def _dates(rng, n, missing):
+    days = rng.integers(0, 5 * 365, size=n)
+    dates = pd.Series(pd.Timestamp("2021-01-01") + pd.to_timedelta(days, unit="D"))
+    dates[rng.random(n) < missing] = pd.NaT
+    return dates
+
+
+def make_main(n, seed=0, pending=0.05):
+    rng = np.random.default_rng(seed)
+    published = _dates(rng, n, 0.0)
+    approved = published - pd.to_timedelta(rng.integers(0, 10, size=n), unit="D")
+    approved[rng.random(n) < pending] = pd.NaT
+    picks = pd.Series(rng.choice(["VEEV", "PEN", "RFAC", "NNE", "OKLO", "SMR"], size=n), dtype=object)
+    picks[rng.random(n) < 0.2] = np.nan
+    return pd.DataFrame({
+        "URL": [f"https://www.intro-act.com/uploads/stash/{i:020d}.pdf" for i in range(n)],
+        "Sector": rng.choice(SECTORS, size=n),
+        "Type": rng.choice(MAIN_TYPES, size=n),
+        "Approval Date": approved,
+        "Publishing Date": published,
+        "Topic": _text(rng, n, 10),
+        "Alpha Idea": picks,
+    })
+
+
+def make_comp(n, seed=1, pending=0.05):
+    rng = np.random.default_rng(seed)
+    published = _dates(rng, n, 0.0)
+    approved = published - pd.to_timedelta(rng.integers(0, 10, size=n), unit="D")
+    approved[rng.random(n) < pending] = pd.NaT
+    tickers = np.array([f"T{i:03d}" for i in range(max(n // 50, 10))])
+    return pd.DataFrame({
+        "URL": [f"https://www.intro-act.com/uploads/email/{i:020d}.pdf" for i in range(n)],
+        "Ticker": rng.choice(tickers, size=n),
+        "Type": rng.choice(COMP_TYPES, size=n),
+        "Approval Date": approved,
+        "Publishing Date": published,
+        "Banner": "PartnerCap",
+        "Title": _text(rng, n, 20),
+    })
+
+
+def make_frames(n, seed=0, pending=0.05):
+    """Raw ``{"main", "comp"}`` frames with ``n`` rows each, as a source's ``fetch()`` returns them.
+
+    ``pending`` is the share of rows with no Approval Date.
+    """
+    return {"main": make_main(n, seed, pending), "comp": make_comp(n, seed + 1, pending)}
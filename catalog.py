@@ -0,0 +1,440 @@
+# catalog.py - one sheet's processed frame plus the indexes built once per snapshot
+import collections
+import copy
+import functools
+import hashlib
+import re
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from filters import FilterIndex
+from preprocess import DATE_COLUMNS, TEXT_DTYPE, compact, format_dates, prepare
+from rollups import Rollup
+from schema import SCHEMAS
+from search import FIELD_SEPARATOR, TOKEN_PATTERN, SearchIndex, bm25, clause_pattern, parse_query
+
+# Low-cardinality columns offered as sidebar filters, stored as Categorical.
+FILTER_FIELDS = {
+    "main": ["Sector", "Type"],
+    "comp": ["Ticker", "Type"],
+}
+
+# Repetitive text columns stored as Categorical: the filters plus display-only labels.
+CATEGORY_FIELDS = {
+    "main": FILTER_FIELDS["main"],
+    "comp": FILTER_FIELDS["comp"] + ["Banner"],
+}
+
+# Fields a keyword search looks at: the visible text of each sheet, never the markup.
+SEARCH_FIELDS = {
+    "main": ["Sector", "Type", "Approval Date", "Publishing Date", "Topic", "Alpha Idea"],
+    "comp": ["Ticker", "Type", "Approval Date", "Publishing Date", "Banner", "Title"],
+}
+
+# Columns of each sheet's results table, in display order.
+TABLE_COLUMNS = {
+    "main": ["Sector", "Type", "Approval Date", "Publishing Date", "Topic", "Alpha Idea", "Link"],
+    "comp": ["Ticker", "Type", "Approval Date", "Publishing Date", "Banner", "Title", "Link"],
+}
+
+# Version of what dump_catalogs() writes and of the processing behind it. Bump
+# it on any change the constants in catalog_fingerprint() don't show, so a
+# persisted snapshot built the old way is rebuilt rather than restored.
+CATALOG_FORMAT = 2
+
+# Rebuild from scratch once this share of slots holds replaced or removed rows,
+# or once a catalog carries this many index segments.
+COMPACT_DEAD_SHARE = 0.25
+COMPACT_SEGMENTS = 16
+
+# Fields identifying a publication when it has no URL.
+IDENTITY_FIELDS = {
+    "main": ["Sector", "Topic", "Publishing Date"],
+    "comp": ["Ticker", "Title", "Publishing Date"],
+}
+
+
+def catalog_fingerprint():
+    """Hash of everything the built catalogs depend on besides the sheets themselves."""
+    inputs = (
+        CATALOG_FORMAT, SCHEMAS, TOKEN_PATTERN, FIELD_SEPARATOR, TEXT_DTYPE, DATE_COLUMNS,
+        FILTER_FIELDS, CATEGORY_FIELDS, SEARCH_FIELDS, IDENTITY_FIELDS,
+    )
+    return hashlib.sha256(repr(inputs).encode()).hexdigest()[:16]
+
+
+def publication_ids(df, fields):
+    """Stable 63-bit ID per row: a hash of the URL, or of ``fields`` when the URL is blank.
+
+    The hash is deterministic across processes, so IDs survive refreshes,
+    restarts and row reordering in the sheet.
+    """
+    key = df["URL"].astype("string") if "URL" in df.columns else pd.Series(pd.NA, index=df.index, dtype="string")
+    blank = key.isna()
+    if blank.any():
+        rows = df.loc[blank]
+        fallback = rows[fields[0]].astype("string").fillna("")
+        for col in fields[1:]:
+            fallback = fallback + "|" + rows[col].astype("string").fillna("")
+        key = key.fillna(fallback)
+    # The same URL listed twice is two publications: number the repeats.
+    repeat = key.groupby(key).cumcount()
+    key = key.where(repeat == 0, key + "#" + repeat.astype("string"))
+    # 63 bits keep the IDs non-negative int64, which SQLite stores natively.
+    return (pd.util.hash_pandas_object(key, index=False).to_numpy() >> np.uint64(1)).astype(np.int64)
+
+
+def search_text(df, fields):
+    """Visible text of each row, as displayed, its fields joined by ``FIELD_SEPARATOR``."""
+    parts = []
+    for col in fields:
+        if col not in df.columns:
+            continue
+        if col in DATE_COLUMNS:
+            parts.append(format_dates(df[col]).where(df[col].notna(), ""))
+        else:
+            parts.append(df[col].astype("string").fillna(""))
+    if not parts:
+        return pd.Series("", index=df.index, dtype="string")
+    text = parts[0]
+    for part in parts[1:]:
+        text = text + FIELD_SEPARATOR + part
+    return text
+
+
+def row_hashes(raw):
+    """Content hash of every raw row, to tell changed rows from unchanged ones."""
+    return pd.util.hash_pandas_object(raw, index=False).to_numpy()
+
+
+ChangeSummary = collections.namedtuple("ChangeSummary", ["added", "changed", "removed"])
+
+
+class Catalog:
+    """A prepared sheet with its search and filter indexes; immutable once built.
+
+    Rows live in append-only *slots*: a refresh keeps the slots of unchanged
+    rows, retires the slots of changed or removed rows and appends the new
+    versions, so only the delta is prepared and indexed. Each append adds
+    one index segment covering its slots. ``order`` lists the live slots in
+    sheet order; every selection is returned in that order, unless ranked
+    by ``rank()``.
+    """
+
+    def __init__(self, name, df, ids, hashes, order, segments, columns, changes=None):
+        self.name = name
+        self.columns = columns
+        self.df = df
+        self.ids = ids
+        self.hashes = hashes
+        self.order = order
+        self.segments = segments
+        self.changes = changes
+        self.slot_of = pd.Series(order, index=pd.Index(ids[order]))
+        self.options = self._options()
+        pending = df["Approval Date"].isna().to_numpy()
+        self.pending = order[pending[order]]
+
+    def _options(self):
+        """Sorted sidebar options per filter column, counting live rows only."""
+        options = {}
+        for col in FILTER_FIELDS[self.name]:
+            if col not in self.df.columns:
+                continue
+            cat = self.df[col].cat
+            codes = np.asarray(cat.codes)[self.order]
+            counts = np.bincount(codes[codes >= 0], minlength=len(cat.categories))
+            options[col] = sorted(cat.categories[counts > 0])
+        return options
+
+    def without_changes(self):
+        """This catalog as the result of a refresh that changed nothing in it: no delta to report.
+
+        The rows and indexes are shared, not copied.
+        """
+        if self.changes is None:
+            return self
+        unchanged = copy.copy(self)
+        unchanged.changes = None
+        return unchanged
+
+    @functools.cached_property
+    def rollup(self):
+        """Analytics cubes over the live rows; built on first use, then kept with this snapshot."""
+        return Rollup(self.df.iloc[self.order], [c for c in FILTER_FIELDS[self.name] if c in self.df.columns])
+
+    def filter_mask(self, selections):
+        """Slot mask for ``{column: [values]}``; None when nothing is selected."""
+        if not any(selections.values()):
+            return None
+        mask = np.zeros(len(self.df), dtype=bool)
+        for start, _, filters in self.segments:
+            part = filters.mask(selections)
+            mask[start:start + filters.size] = part
+        return mask
+
+    def search_mask(self, query):
+        """Slot mask for a keyword query, or None when there is nothing to search for.
+
+        The index finds phrases by their word pairs; rows holding every pair
+        of a longer phrase, but not the phrase itself, are dropped by
+        matching it in their text.
+        """
+        if not query:
+            return None
+        mask = np.zeros(len(self.df), dtype=bool)
+        for start, search, _ in self.segments:
+            part = search.mask(query)
+            if part is None:
+                return None
+            mask[start:start + search.size] = part
+        phrases = [clause for clause in parse_query(query) if len(clause.words) > 2]
+        slots = np.flatnonzero(mask) if phrases else []
+        if len(slots):
+            # Python's re, as the tokenizer uses: Arrow's RE2 only knows ASCII letters for \w and \b.
+            text = search_text(self.df.iloc[slots], SEARCH_FIELDS[self.name]).astype(object)
+            for clause in phrases:
+                pattern = re.compile(clause_pattern(clause), re.IGNORECASE)
+                found = np.fromiter((pattern.search(row) is not None for row in text), dtype=bool, count=len(slots))
+                mask[slots[~found]] = False
+        return mask
+
+    @functools.cached_property
+    def live(self):
+        """Slot mask of the live slots (``order``), None when every slot is live."""
+        if len(self.order) == len(self.df):
+            return None
+        live = np.zeros(len(self.df), dtype=bool)
+        live[self.order] = True
+        return live
+
+    @functools.cached_property
+    def avg_length(self):
+        """Mean tokens per live row, the BM25 length norm."""
+        lengths = np.concatenate([search.lengths for _, search, _ in self.segments])
+        return max(1.0, float(lengths[self.order].mean())) if len(self.order) else 1.0
+
+    def rank(self, rows, query, limit=None):
+        """``rows`` best BM25 match for ``query`` first; equal scores keep their order.
+
+        Each word or phrase pair of the query is one BM25 term, its document
+        frequency counted over the live rows. Scores are quantized to 16 bits, so
+        the stable sort is a radix sort: linear in the matches.
+
+        With ``limit`` only the ``limit`` best rows are returned, e.g. up to
+        the page on screen: they are picked by a partition, and only they are
+        sorted.
+        """
+        clauses = parse_query(query) if query else []
+        if not clauses or len(rows) < 2:
+            return rows[:limit]
+        tf = lengths = df = None
+        for start, search, _ in self.segments:
+            if search.size == len(self.df):
+                inside, local = slice(None), rows  # a single segment: no need to split the rows
+            else:
+                inside = np.flatnonzero((rows >= start) & (rows < start + search.size))
+                local = rows[inside] - start
+            spans = search.spans(clauses)
+            if tf is None:
+                tf = np.zeros((len(spans), len(rows)), dtype=np.float32)
+                df = [0] * len(spans)
+                lengths = np.zeros(len(rows), dtype=np.float32)
+            lengths[inside] = search.lengths[local]
+            for i, span in enumerate(spans):
+                counted, held = search.term_counts(span)
+                tf[i, inside] = counted[local]
+                if self.live is not None:
+                    held = np.count_nonzero(counted[self.live[start:start + search.size]])
+                df[i] += held
+        scores = sum(bm25(tf[i], df[i], len(self.order), lengths, self.avg_length) for i in range(len(df)))
+        top = scores.max()
+        if not top > 0:
+            return rows[:limit]
+        keys = np.iinfo(np.uint16).max - (scores * np.float32(np.iinfo(np.uint16).max / top)).astype(np.uint16)
+        if limit is None or limit >= len(rows):
+            return rows[np.argsort(keys, kind="stable")]
+        # Every row keyed below the limit-th key, then the first of its ties, in sheet order.
+        bound = np.partition(keys, limit - 1)[limit - 1]
+        below = np.flatnonzero(keys < bound)
+        picked = np.union1d(below, np.flatnonzero(keys == bound)[:limit - len(below)])
+        return rows[picked[np.argsort(keys[picked], kind="stable")]]
+
+    def select(self, selections=None, query=None):
+        """Live slots matching the sidebar filters and the keyword query, best match first."""
+        return self.rank(self.rows(self.filter_mask(selections or {}), self.search_mask(query)), query)
+
+    def rows(self, *masks):
+        """Live slots set in every given slot mask (None masks match all), in sheet order."""
+        combined = None
+        for mask in masks:
+            if mask is not None:
+                combined = mask if combined is None else combined & mask
+        if combined is None:
+            return self.order
+        return self.order[combined[self.order]]
+
+
+def _prepare_rows(name, raw, ids):
+    df = compact(prepare(raw.reset_index(drop=True)), CATEGORY_FIELDS[name])
+    df["Publication ID"] = ids
+    return df
+
+
+def _segment(name, df, start):
+    """Search and filter indexes over ``df``, whose first row is slot ``start``."""
+    filter_fields = [c for c in FILTER_FIELDS[name] if c in df.columns]
+    return start, SearchIndex(search_text(df, SEARCH_FIELDS[name]).reset_index(drop=True)), FilterIndex(df, filter_fields)
+
+
+def _append_rows(name, df, fresh):
+    """``df`` followed by ``fresh``, keeping the category columns Categorical.
+
+    Existing category codes are kept, so earlier segments stay valid.
+    """
+    combined = pd.concat([df, fresh], ignore_index=True)
+    for col in CATEGORY_FIELDS[name]:
+        if col in combined.columns:
+            combined[col] = union_categoricals([df[col].array, fresh[col].array])
+    return combined
+
+
+def build_catalog(name, raw, previous=None):
+    """Catalog for one raw sheet, reusing ``previous`` for every unchanged row."""
+    raw = raw.reset_index(drop=True)
+    ids = publication_ids(raw, IDENTITY_FIELDS[name])
+    hashes = row_hashes(raw)
+    if previous is None or list(raw.columns) != previous.columns:
+        return _full_build(name, raw, ids, hashes)
+
+    # Diff against the previous snapshot on publication ID + row content.
+    old_slots = previous.slot_of.reindex(ids).to_numpy()
+    known = ~np.isnan(old_slots)
+    old_slots = np.where(known, old_slots, 0).astype(np.intp)
+    unchanged = known & (previous.hashes[old_slots] == hashes)
+    fresh = np.flatnonzero(~unchanged)
+    changes = ChangeSummary(
+        added=int((~known).sum()),
+        changed=int((known & ~unchanged).sum()),
+        removed=int(len(previous.order) - known.sum()),
+    )
+    start = len(previous.df)
+    order = np.where(unchanged, old_slots, 0)
+    order[fresh] = np.arange(start, start + len(fresh))
+    if not len(fresh) and np.array_equal(order, previous.order):
+        return previous.without_changes()
+
+    dead = start + len(fresh) - len(order)
+    if dead > COMPACT_DEAD_SHARE * (start + len(fresh)) or len(previous.segments) >= COMPACT_SEGMENTS:
+        return _full_build(name, raw, ids, hashes, changes)
+
+    segments = list(previous.segments)
+    df, all_ids, all_hashes = previous.df, previous.ids, previous.hashes
+    if len(fresh):
+        added = _prepare_rows(name, raw.iloc[fresh], ids[fresh])
+        segments.append(_segment(name, added, start))
+        df = _append_rows(name, df, added)
+        all_ids = np.concatenate([all_ids, ids[fresh]])
+        all_hashes = np.concatenate([all_hashes, hashes[fresh]])
+    return Catalog(name, df, all_ids, all_hashes, order, segments, previous.columns, changes)
+
+
+def _full_build(name, raw, ids, hashes, changes=None):
+    df = _prepare_rows(name, raw, ids)
+    return Catalog(name, df, ids, hashes, np.arange(len(df)), [_segment(name, df, 0)], list(raw.columns), changes)
+
+
+def build_catalogs(frames, previous=None):
+    """``SheetCache`` process step: raw frames -> ``{"main": Catalog, "comp": Catalog}``.
+
+    With the ``previous`` catalogs only added and changed rows are prepared
+    and indexed; when nothing changed at all, ``previous`` itself is returned.
+    Each catalog's ``changes`` are those of this refresh only: an unchanged
+    sheet reports none, even if the previous refresh had changed it.
+    """
+    previous = previous or {}
+    catalogs = {name: build_catalog(name, raw, previous.get(name)) for name, raw in frames.items()}
+    if previous and all(catalogs[name] is previous.get(name) for name in catalogs):
+        return previous
+    return catalogs
+
+
+def dump_catalogs(catalogs):
+    """``SnapshotStore`` dump step: catalogs -> plain frames, search indexes included.
+
+    Filter indexes and the derived attributes are cheap to recompute from
+    the categorical codes, so only what a build actually pays for is kept.
+    """
+    frames = {}
+    for name, catalog in catalogs.items():
+        frames[name] = catalog.df
+        frames[f"{name}-slots"] = pd.DataFrame({"hash": catalog.hashes})
+        frames[f"{name}-order"] = pd.DataFrame({"slot": catalog.order})
+        frames[f"{name}-columns"] = pd.DataFrame({"column": catalog.columns})
+        frames[f"{name}-segments"] = pd.DataFrame({
+            "start": [start for start, _, _ in catalog.segments],
+            "size": [search.size for _, search, _ in catalog.segments],
+        })
+        for i, (_, search, _) in enumerate(catalog.segments):
+            # offsets[0] is always 0; the rest line up with the vocabulary.
+            frames[f"{name}-terms-{i}"] = pd.DataFrame({"term": search.vocab, "end": search.offsets[1:]})
+            frames[f"{name}-postings-{i}"] = pd.DataFrame({"row": search.postings, "count": search.counts})
+            frames[f"{name}-lengths-{i}"] = pd.DataFrame({"length": search.lengths})
+            frames[f"{name}-pairs-{i}"] = pd.DataFrame({"pair": search.pairs, "end": search.pair_offsets[1:]})
+            frames[f"{name}-pair-postings-{i}"] = pd.DataFrame({"row": search.pair_postings, "count": search.pair_counts})
+    return frames
+
+
+def load_catalogs(frames):
+    """``SnapshotStore`` restore step: the frames of ``dump_catalogs()`` -> catalogs."""
+    catalogs = {}
+    for name in [name for name in frames if "-" not in name]:
+        df = frames[name]
+        for col in CATEGORY_FIELDS[name]:
+            if col in df.columns:
+                # Arrow hands categories back as "str"; appends need them as built.
+                df[col] = df[col].cat.rename_categories(df[col].cat.categories.astype(TEXT_DTYPE))
+        filter_fields = [c for c in FILTER_FIELDS[name] if c in df.columns]
+        segments = []
+        bounds = frames[f"{name}-segments"]
+        for i, (start, size) in enumerate(zip(bounds["start"].tolist(), bounds["size"].tolist())):
+            terms, pairs = frames[f"{name}-terms-{i}"], frames[f"{name}-pairs-{i}"]
+            postings, pair_postings = frames[f"{name}-postings-{i}"], frames[f"{name}-pair-postings-{i}"]
+            search = SearchIndex.from_arrays(
+                size,
+                vocab=terms["term"].to_numpy(dtype=object),
+                offsets=np.concatenate([[0], terms["end"].to_numpy()]),
+                postings=postings["row"].to_numpy(),
+                counts=postings["count"].to_numpy(),
+                lengths=frames[f"{name}-lengths-{i}"]["length"].to_numpy(),
+                pairs=pairs["pair"].to_numpy(),
+                pair_offsets=np.concatenate([[0], pairs["end"].to_numpy()]),
+                pair_postings=pair_postings["row"].to_numpy(),
+                pair_counts=pair_postings["count"].to_numpy(),
+            )
+            segments.append((start, search, FilterIndex(df.iloc[start:start + size], filter_fields)))
+        catalogs[name] = Catalog(
+            name, df, df["Publication ID"].to_numpy(), frames[f"{name}-slots"]["hash"].to_numpy(),
+            frames[f"{name}-order"]["slot"].to_numpy(), segments, frames[f"{name}-columns"]["column"].tolist(),
+        )
+    return catalogs
+
+
+def change_summary(catalogs):
+    """Human-readable delta of the last refresh, e.g. "3 new publications since last refresh"."""
+    added = changed = removed = 0
+    for catalog in catalogs.values():
+        if catalog.changes:
+            added += catalog.changes.added
+            changed += catalog.changes.changed
+            removed += catalog.changes.removed
+    parts = []
+    if added:
+        parts.append(f"{added} new publication{'s' if added != 1 else ''}")
+    if changed:
+        parts.append(f"{changed} updated")
+    if removed:
+        parts.append(f"{removed} removed")
+    return ", ".join(parts) + " since last refresh" if parts else ""
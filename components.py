@@ -0,0 +1,28 @@
+# components.py - Streamlit widgets shared by the dashboards
+import streamlit as st
+
+from render import PAGE_SIZES, page_count
+
+
+def pager(key, total, state):
+    """Rows-per-page and page-number controls; returns ``(page, page_size)``.
+
+    The page cursor lives in ``st.session_state`` under ``key`` and goes back
+    to page 1 whenever ``state`` (the current filters and search) changes.
+    """
+    page_key, size_key, state_key = f"{key}_page", f"{key}_page_size", f"{key}_filters"
+    if st.session_state.get(state_key) != state:
+        st.session_state[state_key] = state
+        st.session_state[page_key] = 1
+
+    col_size, col_page, col_pages = st.columns([1, 1, 2])
+    with col_size:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, key=size_key)
+    pages = page_count(total, page_size)
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+    with col_page:
+        page = st.number_input("Page", min_value=1, max_value=pages, step=1, key=page_key)
+    with col_pages:
+        st.markdown(f"<p style='font-family: Lexend; margin-top: 2.2rem;'>of {pages}</p>", unsafe_allow_html=True)
+    return page, page_size
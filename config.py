@@ -0,0 +1,76 @@
+# config.py - shared dashboard settings
+import os
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# --------------------------------------------
+# DATA SOURCE
+# --------------------------------------------
+# Backend both dashboards read from: "gsheets" (live Google Sheets exports),
+# "xlsx" (local workbook), "parquet" or "feather" (local columnar snapshot).
+DATA_SOURCE = os.environ.get("DASHBOARD_DATA_SOURCE", "gsheets")
+
+# The whole workbook as one xlsx export (no gid), and the sheets to read from it.
+SHEET_URL = os.environ.get(
+    "DASHBOARD_SHEET_URL",
+    "https://docs.google.com/spreadsheets/d/1WD5zUbyX74X0Z9xikWK7Xs7QfX-6IIFyjoUGmt53Fck/export?format=xlsx&id=1WD5zUbyX74X0Z9xikWK7Xs7QfX-6IIFyjoUGmt53Fck",
+)
+
+# Seconds allowed for one download of the export, retries after a transient
+# failure, and the first backoff (doubled per retry).
+FETCH_TIMEOUT = float(os.environ.get("DASHBOARD_FETCH_TIMEOUT", "30"))
+FETCH_RETRIES = int(os.environ.get("DASHBOARD_FETCH_RETRIES", "3"))
+FETCH_BACKOFF = float(os.environ.get("DASHBOARD_FETCH_BACKOFF", "1"))
+
+
+def _sheet(value):
+    """Sheet names may be given as a position ("0") or a name ("Comp")."""
+    return int(value) if value.isdigit() else value
+
+
+SHEET_MAIN = _sheet(os.environ.get("DASHBOARD_SHEET_MAIN", "0"))
+SHEET_COMP = _sheet(os.environ.get("DASHBOARD_SHEET_COMP", "Comp"))
+
+XLSX_PATH = os.environ.get("DASHBOARD_XLSX_PATH", os.path.join(BASE_DIR, "data", "database.xlsx"))
+XLSX_SHEET_MAIN = os.environ.get("DASHBOARD_XLSX_SHEET_MAIN", "ProgInd")
+XLSX_SHEET_COMP = os.environ.get("DASHBOARD_XLSX_SHEET_COMP", "Comp")
+
+SNAPSHOT_DIR = os.environ.get("DASHBOARD_SNAPSHOT_DIR", os.path.join(BASE_DIR, "data", "snapshot"))
+
+# --------------------------------------------
+# CACHING
+# --------------------------------------------
+# Seconds before the shared sheet cache revalidates against the source.
+DATA_TTL = int(os.environ.get("DASHBOARD_DATA_TTL", "600"))
+
+# Rendered table pages kept in the shared LRU fragment cache.
+FRAGMENT_CACHE_SIZE = int(os.environ.get("DASHBOARD_FRAGMENT_CACHE_SIZE", "256"))
+
+# Recent keyword results kept per session, so a query extending one of them
+# only re-checks that result instead of the whole sheet.
+SEARCH_CACHE_SIZE = int(os.environ.get("DASHBOARD_SEARCH_CACHE_SIZE", "8"))
+
+# Typing pause after which the keyword box reruns the search (st.cache_data ttl format).
+SEARCH_DEBOUNCE = os.environ.get("DASHBOARD_SEARCH_DEBOUNCE", "300ms")
+
+# Where the last processed snapshot is persisted, so a restart renders at once
+# and revalidates in the background. Empty: nothing is written to disk.
+CACHE_DIR = os.environ.get("DASHBOARD_CACHE_DIR", os.path.join(BASE_DIR, "data", "cache"))
+
+# Directory shared by the Streamlit replicas on one host (e.g. under /dev/shm).
+# When set, one replica at a time refreshes the source and every replica maps
+# the parsed sheets from Arrow IPC files there. Empty: each process fetches alone.
+SHARED_CACHE_DIR = os.environ.get("DASHBOARD_SHARED_CACHE_DIR", "")
+
+# --------------------------------------------
+# DIAGNOSTICS
+# --------------------------------------------
+# "1" times every stage, shows p50 / p95 and cache hit rates in a sidebar
+# expander and logs one JSON line per rerun to stderr. Off: no timing at all.
+DIAGNOSTICS = os.environ.get("DASHBOARD_DIAGNOSTICS", "0") == "1"
+
+# --------------------------------------------
+# APPROVALS
+# --------------------------------------------
+# SQLite database holding the approve / pause decisions from the Pending Approvals tab.
+APPROVALS_DB = os.environ.get("DASHBOARD_APPROVALS_DB", os.path.join(BASE_DIR, "data", "approvals.db"))
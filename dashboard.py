@@ -1,31 +1,21 @@
 # dashboard.py
 import streamlit as st
-import pandas as pd
 from streamlit_option_menu import option_menu
-import plotly.express as px
+
+from components import pager
+from preprocess import LINK_MARKDOWN, display_frame
+from render import page_rows
+from resources import get_sheet_cache, load_data, stale_note
 
 # --------------------------------------------
 # CONFIGURATION
 # --------------------------------------------
 st.set_page_config(page_title="📚 Intro-act Research Publications Dashboard", layout="wide")
 
-sheet_url_main = "https://docs.google.com/spreadsheets/d/1WD5zUbyX74X0Z9xikWK7Xs7QfX-6IIFyjoUGmt53Fck/export?format=xlsx&id=1WD5zUbyX74X0Z9xikWK7Xs7QfX-6IIFyjoUGmt53Fck&gid=0"
-sheet_url_comp = "https://docs.google.com/spreadsheets/d/1WD5zUbyX74X0Z9xikWK7Xs7QfX-6IIFyjoUGmt53Fck/export?format=xlsx&id=1WD5zUbyX74X0Z9xikWK7Xs7QfX-6IIFyjoUGmt53Fck&gid=536512581"
-
-def load_data():
-    df_main = pd.read_excel(sheet_url_main)
-    df_comp = pd.read_excel(sheet_url_comp)
-    for df in [df_main, df_comp]:
-        df.fillna("-", inplace=True)
-        df["Approval Date"] = df["Approval Date"].apply(lambda x: x.strftime("%B %d, %Y"))
-        df["Publishing Date"] = df["Publishing Date"].apply(lambda x: x.strftime("%B %d, %Y"))
-        if 'URL' in df.columns:
-            df['Link'] = df['URL'].apply(lambda x: f"[Read here.]({x})" if x != "-" else "")
-   
-    return df_main, df_comp
-
 # Load Data
-df_main, df_comp = load_data()
+snapshot = load_data()
+catalogs = snapshot.data
+df_main, df_comp = catalogs["main"].df, catalogs["comp"].df
 
 # --------------------------------------------
 # STYLING
@@ -54,10 +44,9 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Logo and Header
-from datetime import datetime
 
 # Last Refreshed Date
-last_refreshed = datetime.now().strftime("%B %d, %Y")
+last_refreshed = snapshot.fetched_at.strftime("%B %d, %Y %H:%M") + stale_note()
 
 # Header styling
 st.markdown("""
@@ -136,33 +125,33 @@ tab = option_menu(
 # --------------------------------------------
 if tab == "Progressive Industries":
 
-    sectors = st.sidebar.multiselect("Sector", df_main['Sector'].unique())
-    types = st.sidebar.multiselect("Type", df_main['Type'].unique())
+    sectors = st.sidebar.multiselect("Sector", catalogs["main"].options['Sector'])
+    types = st.sidebar.multiselect("Type", catalogs["main"].options['Type'])
 
-    filtered_df = df_main.copy()
-    if sectors:
-        filtered_df = filtered_df[filtered_df['Sector'].isin(sectors)]
-    if types:
-        filtered_df = filtered_df[filtered_df['Type'].isin(types)]
+    rows = catalogs["main"].select({'Sector': sectors, 'Type': types})
     
     if st.sidebar.button("🔄 Refresh Data"):
-        st.cache_data.clear()
+        get_sheet_cache().invalidate()
+        st.toast("Refreshing data in the background...")
 
-    st.subheader(f"✅ Found {len(filtered_df)} matching publications...")
-    st.write(filtered_df[['Sector', 'Type', 'Approval Date', 'Publishing Date', 'Topic', 'Alpha Idea', 'Link']].to_markdown(index=False), unsafe_allow_html=True)
+    st.subheader(f"✅ Found {len(rows)} matching publications...")
+    page, page_size = pager("main", len(rows), (sectors, types))
+    filtered_df = df_main.iloc[page_rows(rows, page, page_size)]
+    st.write(display_frame(filtered_df, ['Sector', 'Type', 'Approval Date', 'Publishing Date', 'Topic', 'Alpha Idea', 'Link'], date_format="%B %d, %Y", link_format=LINK_MARKDOWN, bold_columns=()).to_markdown(index=False), unsafe_allow_html=True)
 
 # --------------------------------------------
 # TAB 2: comp
 # --------------------------------------------
 if tab == "Sell-Side Equity Research":
 
-    companies = st.sidebar.multiselect("Ticker", df_comp['Ticker'].unique())
-    filtered_df = df_comp.copy()
-    if companies:
-        filtered_df = filtered_df[filtered_df['Ticker'].isin(companies)]
+    companies = st.sidebar.multiselect("Ticker", catalogs["comp"].options['Ticker'])
+    rows = catalogs["comp"].select({'Ticker': companies})
 
     if st.sidebar.button("🔄 Refresh Data"):
-        st.cache_data.clear()
+        get_sheet_cache().invalidate()
+        st.toast("Refreshing data in the background...")
 
-    st.subheader(f"✅ Found {len(filtered_df)} matching publications...")
-    st.write(filtered_df[['Ticker', 'Type', 'Approval Date', 'Publishing Date', 'Banner', 'Title', 'Link']].to_markdown(index=False), unsafe_allow_html=True)
\ No newline at end of file
+    st.subheader(f"✅ Found {len(rows)} matching publications...")
+    page, page_size = pager("comp", len(rows), (companies,))
+    filtered_df = df_comp.iloc[page_rows(rows, page, page_size)]
+    st.write(display_frame(filtered_df, ['Ticker', 'Type', 'Approval Date', 'Publishing Date', 'Banner', 'Title', 'Link'], date_format="%B %d, %Y", link_format=LINK_MARKDOWN, bold_columns=()).to_markdown(index=False), unsafe_allow_html=True)
\ No newline at end of file
@@ -0,0 +1,736 @@
+# data_source.py - data-source backends and the shared snapshot cache
+import abc
+import collections
+import contextlib
+import hashlib
+import importlib.util
+import io
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows: no shared cache tier
+    fcntl = None
+
+import pandas as pd
+import requests
+
+from diagnostics import timings
+from schema import SCHEMAS, SchemaError, conform
+
+logger = logging.getLogger(__name__)
+
+# Column names used by the archived workbook layout (data/database.xlsx).
+LEGACY_COLUMNS = {"Date": "Publishing Date", "Pick (s)": "Alpha Idea"}
+
+# calamine (Rust) parses xlsx several times faster than openpyxl; use it when installed.
+EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else "openpyxl"
+
+# --------------------------------------------
+# FETCHING
+# --------------------------------------------
+# Answers worth retrying: the server was busy or failed, not the request.
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+# Longest sleep between two attempts, however many have failed.
+BACKOFF_MAX = 30
+
+# Seconds allowed to open the connection (the whole download gets ``timeout``).
+CONNECT_TIMEOUT = 5
+
+
+def http_session(pool_size=4):
+    """HTTP session whose keep-alive connections are reused by every revalidation."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _download(session, url, headers, timeout):
+    start = time.monotonic()
+    with session.get(url, headers=headers, timeout=(min(CONNECT_TIMEOUT, timeout), timeout), stream=True) as response:
+        if response.status_code == 304:
+            return None, headers.get("If-None-Match"), headers.get("If-Modified-Since")
+        response.raise_for_status()
+        body = bytearray()
+        for chunk in response.iter_content(1 << 16):
+            body += chunk
+            if time.monotonic() - start > timeout:
+                raise requests.Timeout(f"download of {url} took over {timeout}s")
+        return bytes(body), response.headers.get("ETag"), response.headers.get("Last-Modified")
+
+
+def fetch_export(url, etag=None, last_modified=None, timeout=30, retries=3, backoff=1.0, session=None):
+    """Conditionally download one export.
+
+    Returns ``(body, etag, last_modified)``; ``body`` is None when the server
+    answered 304 Not Modified. ``timeout`` bounds the whole download, not
+    each read. Connection errors, timeouts and RETRY_STATUSES answers are
+    retried up to ``retries`` times, sleeping ``backoff`` seconds doubled per
+    attempt (capped at BACKOFF_MAX, with jitter); then the last error is raised.
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    for attempt in range(retries + 1):
+        try:
+            return _download(session or requests, url, headers, timeout)
+        except requests.RequestException as e:
+            status = e.response.status_code if e.response is not None else None
+            if attempt == retries or (status is not None and status not in RETRY_STATUSES):
+                raise
+            delay = min(BACKOFF_MAX, backoff * 2 ** attempt) * random.uniform(0.5, 1)
+            logger.warning("Fetching %s failed (%s); retry %d/%d in %.1fs", url, e, attempt + 1, retries, delay)
+            time.sleep(delay)
+
+
+def read_workbook(workbook, sheets, header=0):
+    """Read the wanted sheets of one workbook as untyped frames; ``schema.conform`` types them.
+
+    ``workbook`` is a path or file-like object and is opened once for all
+    sheets; ``sheets`` maps "main" / "comp" to a sheet name or index. Only
+    the columns in ``SCHEMAS`` are kept, archived names mapped onto them.
+    A sheet the workbook lacks raises ``SchemaError`` naming the ones it has.
+    """
+    frames = {}
+    with pd.ExcelFile(workbook, engine=EXCEL_ENGINE) as book:
+        for name, sheet in sheets.items():
+            found = sheet < len(book.sheet_names) if isinstance(sheet, int) else sheet in book.sheet_names
+            if not found:
+                raise SchemaError(f"{name} sheet: the workbook has no sheet {sheet!r}; "
+                                  f"its sheets are {', '.join(map(repr, book.sheet_names))}")
+            frames[name] = normalize_columns(_read_sheet(book, sheet, header, set(SCHEMAS[name]) | set(LEGACY_COLUMNS)))
+    return frames
+
+
+def _read_sheet(book, sheet, header, wanted):
+    """The ``wanted`` columns of one sheet as cells, indexed by data row; blank lines are dropped."""
+    if EXCEL_ENGINE != "calamine":
+        return book.parse(sheet, header=header, usecols=lambda c: c in wanted, dtype=object)
+    # pandas would convert every cell of the sheet one by one in Python before
+    # dropping the unused columns; calamine's rows leave only the wanted ones to type.
+    cells = book.book.get_sheet_by_index(sheet) if isinstance(sheet, int) else book.book.get_sheet_by_name(sheet)
+    rows = cells.to_python(skip_empty_area=False)
+    body = rows[header + 1:]
+    columns = {}
+    for i, col in enumerate(rows[header] if len(rows) > header else []):
+        if col in wanted and col not in columns:
+            columns[col] = [row[i] for row in body]
+    df = pd.DataFrame(columns, dtype=object)
+    empty = df.isin([""])  # calamine's empty cells; pandas would have read them as missing
+    return df.mask(empty)[~empty.all(axis=1)]
+
+
+def normalize_columns(df):
+    """Bring a sheet in the archived workbook layout onto the live column names."""
+    df = df.loc[:, [c for c in df.columns if not str(c).startswith("Unnamed")]]
+    df = df.rename(columns=LEGACY_COLUMNS)
+    if "Approval Date" not in df.columns and "Publishing Date" in df.columns:
+        # Archived pieces were all published, hence approved.
+        df["Approval Date"] = df["Publishing Date"]
+    return df
+
+
+# --------------------------------------------
+# BACKENDS
+# --------------------------------------------
+# Every backend exposes ``fetch()``, returning a dict of frames keyed by
+# sheet ("main", "comp") and typed by ``schema.SCHEMAS`` when the data
+# changed since the previous call, or None when it did not. A sheet that
+# fails its schema raises ``SchemaError``, so the SheetCache keeps serving
+# the last good snapshot.
+
+class GoogleSheetsSource:
+    """Live Google Sheets workbook, downloaded once as a single xlsx export.
+
+    The export is revalidated with ETag / Last-Modified, falling back to a
+    SHA-256 of the body when the server sends no validators, so an unchanged
+    workbook is never parsed twice. Downloads reuse pooled connections and
+    retry transient failures (see ``fetch_export``).
+    """
+
+    def __init__(self, url, sheets, header=0, timeout=30, retries=3, backoff=1.0):
+        self.url = url
+        self.sheets = dict(sheets)
+        self.header = header
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.session = http_session()
+        self._etag = None
+        self._last_modified = None
+        self._digest = None
+
+    def validators(self):
+        """What tells an unchanged export apart, as JSON-safe values (see ``SnapshotStore``)."""
+        return {"etag": self._etag, "last_modified": self._last_modified, "digest": self._digest}
+
+    def restore_validators(self, validators):
+        self._etag, self._last_modified, self._digest = (validators.get(k) for k in ("etag", "last_modified", "digest"))
+
+    def fetch(self):
+        with timings.timed("fetch"):
+            body, etag, last_modified = fetch_export(
+                self.url, self._etag, self._last_modified,
+                timeout=self.timeout, retries=self.retries, backoff=self.backoff, session=self.session,
+            )
+        frames, digest = None, self._digest
+        if body is not None:
+            digest = hashlib.sha256(body).hexdigest()
+            if digest != self._digest:
+                with timings.timed("parse"):
+                    # A rejected workbook raises before the validators move on,
+                    # so the next revalidation downloads and checks it again.
+                    frames = conform(read_workbook(io.BytesIO(body), self.sheets, header=self.header), self.header + 2)
+        self._etag, self._last_modified, self._digest = etag, last_modified, digest
+        return frames
+
+
+class _LocalSource(abc.ABC):
+    """Base for file backends: re-read only when a file's mtime or size changes."""
+
+    def __init__(self):
+        self._signature = None
+
+    @abc.abstractmethod
+    def paths(self):
+        """The files whose mtime and size tell whether the source changed."""
+
+    @abc.abstractmethod
+    def read(self):
+        """The sheets as ``{name: DataFrame}``, read from ``paths()``."""
+
+    def validators(self):
+        return {"signature": self._signature}
+
+    def restore_validators(self, validators):
+        signature = validators.get("signature")
+        self._signature = tuple(tuple(entry) for entry in signature) if signature else None
+
+    def fetch(self):
+        with timings.timed("fetch"):
+            signature = tuple((p, os.stat(p).st_mtime_ns, os.stat(p).st_size) for p in self.paths())
+        if signature == self._signature:
+            return None
+        with timings.timed("parse"):
+            frames = self.read()
+        self._signature = signature
+        return frames
+
+
+class LocalXlsxSource(_LocalSource):
+    """A workbook on disk, by default the archived ``data/database.xlsx``."""
+
+    def __init__(self, path, sheets, header=1):
+        super().__init__()
+        self.path = path
+        self.sheets = dict(sheets)
+        self.header = header
+
+    def paths(self):
+        return [self.path]
+
+    def read(self):
+        return conform(read_workbook(self.path, self.sheets, header=self.header), self.header + 2)
+
+
+class ParquetSnapshotSource(_LocalSource):
+    """Columnar snapshot directory holding ``main`` and ``comp`` as Parquet or Feather.
+
+    Files are memory-mapped, so loading a snapshot costs milliseconds and
+    needs no network; see ``write_snapshot`` for producing one.
+    """
+
+    def __init__(self, directory, fmt="parquet", names=("main", "comp")):
+        super().__init__()
+        self.directory = directory
+        self.fmt = fmt
+        self.names = tuple(names)
+
+    def paths(self):
+        return [os.path.join(self.directory, f"{name}.{self.fmt}") for name in self.names]
+
+    def read(self):
+        if self.fmt == "feather":
+            import pyarrow.feather as feather
+            frames = {name: feather.read_table(path, memory_map=True).to_pandas()
+                      for name, path in zip(self.names, self.paths())}
+        else:
+            frames = {name: pd.read_parquet(path, engine="pyarrow", memory_map=True)
+                      for name, path in zip(self.names, self.paths())}
+        return conform(frames)
+
+
+def _arrow_safe(df):
+    """Copy of ``df`` whose mixed-type object columns are stringified."""
+    df = df.copy()
+    for col in df.columns[df.dtypes == object]:
+        # Arrow needs one type per column; sheets mix numbers and text (e.g. PT).
+        if pd.api.types.infer_dtype(df[col], skipna=True).startswith("mixed"):
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+def write_snapshot(frames, directory, fmt="parquet"):
+    """Write raw frames as a snapshot readable by ``ParquetSnapshotSource``."""
+    os.makedirs(directory, exist_ok=True)
+    for name, df in frames.items():
+        df = _arrow_safe(df)
+        path = os.path.join(directory, f"{name}.{fmt}")
+        if fmt == "feather":
+            df.reset_index(drop=True).to_feather(path)
+        else:
+            df.to_parquet(path, engine="pyarrow", index=False)
+
+
+def _arrow_buffers(frames):
+    """Each frame as Arrow IPC file bytes, and one SHA-256 over all of them."""
+    import pyarrow as pa
+
+    buffers = {}
+    for name, df in frames.items():
+        sink = pa.BufferOutputStream()
+        table = pa.Table.from_pandas(_arrow_safe(df), preserve_index=False)
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        buffers[name] = sink.getvalue()
+    return buffers, hashlib.sha256(b"".join(buffers[name] for name in sorted(buffers))).hexdigest()
+
+
+def _write_atomic(path, data):
+    """Write the bytes-like ``data`` so readers see the old file or the whole new one.
+
+    The temporary file is unique to this write, so processes writing the
+    same ``path`` never interleave in it.
+    """
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
+
+
+@contextlib.contextmanager
+def _file_lock(path, shared=False):
+    """Hold an ``flock`` on ``path`` (created if missing); without ``fcntl`` (Windows) nothing is locked."""
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _write_generation(directory, buffers, version):
+    """Write ``{name: bytes}`` as ``name.<version>.arrow`` files; returns ``{name: file}``."""
+    files = {name: f"{name}.{version}.arrow" for name in buffers}
+    for name, buffer in buffers.items():
+        _write_atomic(os.path.join(directory, files[name]), buffer)
+    return files
+
+
+def _read_generation(directory, files):
+    """Memory-map the ``{name: file}`` Arrow IPC files of one generation back into frames."""
+    import pyarrow as pa
+
+    return {
+        name: pa.ipc.open_file(pa.memory_map(os.path.join(directory, file))).read_all().to_pandas()
+        for name, file in files.items()
+    }
+
+
+def _prune_generations(directory, version, keep):
+    """Unlink generation files more than ``keep`` versions older than ``version``."""
+    for file in os.listdir(directory):
+        parts = file.split(".")
+        if len(parts) == 3 and parts[2] == "arrow" and parts[1].isdigit() and int(parts[1]) <= version - keep:
+            os.remove(os.path.join(directory, file))
+
+
+class SharedSnapshotSource:
+    """Share one backend's parsed sheets between processes on the same host.
+
+    Every Streamlit replica wraps its backend in one of these pointing at
+    the same ``directory``. Replicas take turns on an ``flock`` of
+    ``refresh.lock``; whichever holds it while the shared copy is ``ttl``
+    seconds old revalidates ``source``, writes changed sheets as a new
+    generation of Arrow IPC files and bumps the version in ``stamp.json``.
+    Every replica, the refresher included, then memory-maps the newest
+    generation instead of downloading and parsing the workbook itself.
+    Generation files are never rewritten, so mapping them needs no lock;
+    old generations are unlinked, which is safe while mapped.
+
+    A failed revalidation is recorded in the stamp too (``error``), so the
+    other replicas raise it rather than each retry the backend before
+    ``ttl`` runs out. ``fetched_at`` is when the backend was last checked
+    successfully, by whichever replica: the same on every replica.
+    """
+
+    def __init__(self, source, directory, ttl=600, keep=2):
+        if fcntl is None:
+            raise RuntimeError("The shared snapshot cache needs POSIX file locks (fcntl)")
+        self.source = source
+        self.directory = directory
+        self.ttl = ttl
+        self.keep = keep
+        self._version = None
+        self._force = False
+        self.fetched_at = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def stamp(self):
+        """The shared ``stamp.json`` contents, or None before the first refresh."""
+        try:
+            with open(self._path("stamp.json")) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _refresh_lock(self):
+        return _file_lock(self._path("refresh.lock"))
+
+    def invalidate(self):
+        """Have the next refresher revalidate the backend even if the shared copy is fresh."""
+        self._force = True
+
+    def fetch(self):
+        # Replicas queue on the lock; the first to find the shared copy stale
+        # refreshes it, the rest find it fresh and just map what it wrote.
+        with self._refresh_lock():
+            stamp = self.stamp()
+            if self._force or stamp is None or time.time() - stamp["checked_at"] >= self.ttl:
+                self._force = False
+                stamp = self._publish(stamp)
+        if stamp is None:
+            return None
+        frames = None
+        if stamp["files"] and stamp["version"] != self._version:
+            with timings.timed("parse"):
+                frames = _read_generation(self.directory, stamp["files"])
+            self._version = stamp["version"]
+        elif stamp.get("error"):
+            raise RuntimeError(f"The shared refresh of {type(self.source).__name__} failed: {stamp['error']}")
+        if stamp.get("fetched_at"):
+            self.fetched_at = datetime.fromisoformat(stamp["fetched_at"])
+        return frames
+
+    def _publish(self, stamp):
+        """Revalidate the backend and write a new generation if the sheets changed; returns the stamp.
+
+        A failure is written to the stamp, then raised.
+        """
+        try:
+            frames = self.source.fetch()
+        except Exception as e:
+            failed = dict(stamp or {"version": 0, "digest": None, "files": {}},
+                          checked_at=time.time(), error=f"{type(e).__name__}: {e}")
+            _write_atomic(self._path("stamp.json"), json.dumps(failed).encode())
+            raise
+        if frames is not None:
+            buffers, digest = _arrow_buffers(frames)
+        fetched_at = datetime.now().isoformat(timespec="seconds")
+        if frames is None or (stamp and digest == stamp["digest"]):
+            stamp = dict(stamp, fetched_at=fetched_at, checked_at=time.time(), error=None) if stamp else None
+        else:
+            version = stamp["version"] + 1 if stamp else 1
+            files = _write_generation(self.directory, buffers, version)
+            stamp = {"version": version, "digest": digest, "files": files,
+                     "fetched_at": fetched_at, "checked_at": time.time()}
+            _prune_generations(self.directory, version, self.keep)
+        if stamp:
+            _write_atomic(self._path("stamp.json"), json.dumps(stamp).encode())
+        return stamp
+
+
+class SnapshotStore:
+    """Keep the last processed snapshot on local disk, for instant warm restarts.
+
+    ``dump(data)`` turns a snapshot's data into ``{name: DataFrame}`` and
+    ``restore(frames)`` turns those back into the data, so a restart skips the
+    download, the parse and the processing alike. Each new snapshot is
+    written to ``directory`` as a generation of Arrow IPC files, with
+    ``snapshot.json`` recording its fetch time, a SHA-256 of the files and
+    the backend's validators (ETag / Last-Modified / body hash, or file
+    signature): handed back to the backend after a restart, they make the
+    first revalidation of an unchanged source a 304 rather than a download.
+    Replicas started from one checkout share ``directory``: saves take turns
+    on an ``flock`` of ``snapshot.lock`` (loads share it), so two of them never
+    claim the same version or prune a generation being read.
+
+    ``fingerprint`` identifies the code that built the data. A snapshot
+    persisted under another fingerprint, or whose files no longer match
+    their SHA-256, is not loaded: its validators would have the backend
+    report an unchanged source, and data processed the old way would be
+    served until the source itself changed.
+    """
+
+    def __init__(self, directory, dump, restore, fingerprint="", keep=2):
+        self.directory = directory
+        self.dump = dump
+        self.restore = restore
+        self.fingerprint = fingerprint
+        self.keep = keep
+        # The data this process last saved or loaded, and its version on disk.
+        self._data = None
+        self._version = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def stamp(self):
+        """The ``snapshot.json`` contents, or None before anything was persisted."""
+        try:
+            with open(self._path("snapshot.json")) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _digest(self, files):
+        """SHA-256 of the ``{name: file}`` generation, as ``_arrow_buffers()`` computed it when writing."""
+        digest = hashlib.sha256()
+        for name in sorted(files):
+            with open(self._path(files[name]), "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+        return digest.hexdigest()
+
+    def load(self):
+        """The persisted ``(data, fetched_at, validators)``, or None when there is none (or none usable)."""
+        with _file_lock(self._path("snapshot.lock"), shared=True):
+            stamp = self.stamp()
+            if stamp is None:
+                return None
+            if stamp.get("fingerprint") != self.fingerprint:
+                logger.info("Ignoring the snapshot persisted in %s: built by another version of the code", self.directory)
+                return None
+            with timings.timed("parse"):
+                if self._digest(stamp["files"]) != stamp["digest"]:
+                    logger.warning("Ignoring the snapshot persisted in %s: its files do not match their digest", self.directory)
+                    return None
+                data = self.restore(_read_generation(self.directory, stamp["files"]))
+        self._data, self._version = data, stamp["version"]
+        return data, datetime.fromisoformat(stamp["fetched_at"]), stamp["validators"]
+
+    def save(self, snapshot, validators):
+        """Persist ``snapshot``; when its data is the one on disk only the stamp is rewritten.
+
+        The data on disk may since have been replaced by another process,
+        then this one's is written as a new generation after it.
+        """
+        with _file_lock(self._path("snapshot.lock")):
+            stamp = self.stamp()
+            if stamp is None or snapshot.data is not self._data or stamp["version"] != self._version:
+                buffers, digest = _arrow_buffers(self.dump(snapshot.data))
+                version = stamp["version"] + 1 if stamp else 1
+                stamp = {"version": version, "digest": digest, "fingerprint": self.fingerprint,
+                         "files": _write_generation(self.directory, buffers, version)}
+            stamp.update(validators=validators, fetched_at=snapshot.fetched_at.isoformat(timespec="seconds"))
+            _write_atomic(self._path("snapshot.json"), json.dumps(stamp).encode())
+            _prune_generations(self.directory, stamp["version"], self.keep)
+        self._data, self._version = snapshot.data, stamp["version"]
+
+
+def make_source(kind, config):
+    """Build the backend named ``kind`` ("gsheets", "xlsx", "parquet" or "feather").
+
+    With ``config.SHARED_CACHE_DIR`` set, the backend is wrapped in a
+    ``SharedSnapshotSource`` so replicas on one host fetch it only once.
+    """
+    if kind == "gsheets":
+        source = GoogleSheetsSource(
+            config.SHEET_URL, {"main": config.SHEET_MAIN, "comp": config.SHEET_COMP},
+            timeout=config.FETCH_TIMEOUT, retries=config.FETCH_RETRIES, backoff=config.FETCH_BACKOFF,
+        )
+    elif kind == "xlsx":
+        source = LocalXlsxSource(config.XLSX_PATH, {"main": config.XLSX_SHEET_MAIN, "comp": config.XLSX_SHEET_COMP})
+    elif kind in ("parquet", "feather"):
+        source = ParquetSnapshotSource(config.SNAPSHOT_DIR, fmt=kind)
+    else:
+        raise ValueError(f"Unknown data source {kind!r}; expected gsheets, xlsx, parquet or feather")
+    if config.SHARED_CACHE_DIR:
+        source = SharedSnapshotSource(source, config.SHARED_CACHE_DIR, ttl=config.DATA_TTL)
+    return source
+
+
+# --------------------------------------------
+# SHARED CACHE
+# --------------------------------------------
+# One immutable generation of processed data. ``fetched_at`` is when its
+# source was last checked successfully, not when a page was rendered:
+# revalidations that find nothing new move it forward too.
+Snapshot = collections.namedtuple("Snapshot", ["data", "fetched_at", "version"])
+
+
+class SheetCache:
+    """Process-wide cache of the processed data, shared by all sessions.
+
+    ``process(frames, previous)`` turns the raw frames into what the
+    dashboard renders, given the previous snapshot's data (None at first) so
+    it can apply only the delta; returning ``previous`` unchanged keeps the
+    snapshot version. It only runs when the source reports a change. Without a
+    refresher, the first ``get()`` after ``ttl`` seconds revalidates inline;
+    after ``start()`` a daemon thread revalidates every ``ttl`` seconds and
+    swaps in new snapshots, so readers never wait on the source once the
+    first snapshot exists. A failed refresh keeps the current snapshot and
+    records ``failed_at`` / ``error`` until the next successful one, so the
+    dashboard can flag the data as stale; only a failed first load raises.
+    With a ``store`` (``SnapshotStore``) every refreshed snapshot is also
+    persisted, and ``start()`` serves the persisted one until the refresher
+    has revalidated it.
+    """
+
+    def __init__(self, source, process, ttl=600, store=None):
+        self.source = source
+        self.process = process
+        self.ttl = ttl
+        self.store = store
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._snapshot = None
+        self._checked_at = None
+        # When and why the last refresh failed; None once one succeeds again.
+        self.failed_at = None
+        self.error = None
+        # Revalidations that found the source unchanged / that rebuilt the data.
+        self.hits = 0
+        self.misses = 0
+
+    def get(self):
+        return self.snapshot().data
+
+    def snapshot(self):
+        """Current ``Snapshot``; only blocks while there is none yet (or it expired without a refresher)."""
+        snapshot = self._snapshot
+        if snapshot is None or (self._thread is None and self._expired()):
+            with self._lock:
+                if self._snapshot is None or (self._thread is None and self._expired()):
+                    self._refresh()
+            snapshot = self._snapshot
+        return snapshot
+
+    def invalidate(self):
+        """Revalidate now (in the background when running), keeping the validators."""
+        if hasattr(self.source, "invalidate"):
+            self.source.invalidate()
+        self._checked_at = None
+        self._wake.set()
+
+    def start(self):
+        """Start the background refresher thread; safe to call more than once.
+
+        A snapshot persisted by an earlier process becomes the first snapshot
+        right away; the refresher then revalidates it at once, not after ``ttl``.
+        """
+        with self._lock:
+            if self._thread is None:
+                if self._snapshot is None and self.store is not None:
+                    self._load()
+                self._thread = threading.Thread(target=self._run, name="sheet-refresher", daemon=True)
+                self._thread.start()
+
+    def _load(self):
+        try:
+            loaded = self.store.load()
+        except Exception:
+            logger.exception("Could not load the snapshot persisted in %s; fetching afresh", self.store.directory)
+            return
+        if loaded is not None:
+            data, fetched_at, validators = loaded
+            if hasattr(self.source, "restore_validators"):
+                self.source.restore_validators(validators)
+            self._snapshot = Snapshot(data, fetched_at, 1)
+            self._wake.set()
+
+    def _save(self):
+        validators = self.source.validators() if hasattr(self.source, "validators") else {}
+        try:
+            self.store.save(self._snapshot, validators)
+        except Exception:
+            # Serving the new data matters more than persisting it.
+            logger.exception("Could not persist the snapshot to %s", self.store.directory)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.ttl)
+            self._wake.clear()
+            try:
+                with self._lock:
+                    self._refresh()
+            except Exception:
+                # No snapshot yet: sessions retry inline meanwhile, the next cycle retries too.
+                logger.exception("Background refresh from %s failed", type(self.source).__name__)
+
+    def _expired(self):
+        return self._checked_at is None or time.monotonic() - self._checked_at >= self.ttl
+
+    def _refresh(self):
+        try:
+            frames = self.source.fetch()
+            # A shared source knows when the backend was checked, by whichever replica.
+            fetched_at = getattr(self.source, "fetched_at", None) or datetime.now()
+            previous = self._snapshot
+            # Single reference assignments: readers see the old or the new snapshot, never a mix.
+            if frames is None:
+                self.hits += 1
+                if previous:
+                    self._snapshot = previous._replace(fetched_at=fetched_at)
+            else:
+                self.misses += 1
+                with timings.timed("preprocess"):
+                    data = self.process(frames, previous.data if previous else None)
+                if previous and data is previous.data:
+                    self._snapshot = previous._replace(fetched_at=fetched_at)
+                else:
+                    self._snapshot = Snapshot(data, fetched_at, previous.version + 1 if previous else 1)
+                if self.store is not None:
+                    self._save()
+        except Exception as e:
+            self.failed_at, self.error = datetime.now(), f"{type(e).__name__}: {e}"
+            self._checked_at = time.monotonic()
+            if self._snapshot is None:
+                logger.error("Loading from %s failed: %s", type(self.source).__name__, self.error)
+                raise
+            logger.exception("Refresh from %s failed; serving the snapshot fetched at %s",
+                             type(self.source).__name__, self._snapshot.fetched_at)
+            return
+        self.failed_at = self.error = None
+        self._checked_at = time.monotonic()
+
+
+# --------------------------------------------
+# CLI: python data_source.py snapshot [directory] [parquet|feather]
+# --------------------------------------------
+if __name__ == "__main__":
+    import config
+
+    if len(sys.argv) < 2 or sys.argv[1] != "snapshot":
+        sys.exit("usage: python data_source.py snapshot [directory] [parquet|feather]")
+    directory = sys.argv[2] if len(sys.argv) > 2 else config.SNAPSHOT_DIR
+    fmt = sys.argv[3] if len(sys.argv) > 3 else "parquet"
+    frames = make_source(config.DATA_SOURCE, config).fetch()
+    write_snapshot(frames, directory, fmt)
+    print(f"Wrote {', '.join(frames)} from {config.DATA_SOURCE} to {directory} as {fmt}")
@@ -0,0 +1,86 @@
+# diagnostics.py - per-stage timings, rolling percentiles and one structured log line per rerun
+import collections
+import contextlib
+import json
+import logging
+import sys
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger("dashboard.diagnostics")
+
+STAGES = ["fetch", "parse", "preprocess", "filter", "search", "render", "rerun"]
+
+
+class StageTimings:
+    """Rolling window of recent durations per stage, shared by every session and the refresher.
+
+    Disabled until ``enable()``: ``timed()`` then returns before reading the
+    clock, so an instrumented run costs one attribute check per stage.
+    """
+
+    def __init__(self, window=500):
+        self.window = window
+        self.enabled = False
+        self._samples = collections.defaultdict(lambda: collections.deque(maxlen=self.window))
+        self._lock = threading.Lock()
+
+    def enable(self):
+        """Start recording and send the per-rerun log lines to stderr; safe to call on every rerun."""
+        if not self.enabled:
+            self.enabled = True
+            if not logger.handlers:
+                handler = logging.StreamHandler(sys.stderr)
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                logger.addHandler(handler)
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+
+    @contextlib.contextmanager
+    def timed(self, stage, into=None):
+        """Time the block as ``stage``; also adds the seconds to ``into[stage]`` when given."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.record(stage, seconds)
+            if into is not None:
+                into[stage] = into.get(stage, 0.0) + seconds
+
+    def record(self, stage, seconds):
+        with self._lock:
+            self._samples[stage].append(seconds)
+
+    def summary(self):
+        """``{stage: (runs, p50 ms, p95 ms)}`` over the window, in pipeline order."""
+        with self._lock:
+            samples = {stage: np.array(values) for stage, values in self._samples.items() if values}
+        order = sorted(samples, key=lambda s: STAGES.index(s) if s in STAGES else len(STAGES))
+        return {
+            stage: (len(samples[stage]), *(np.percentile(samples[stage], [50, 95]) * 1e3))
+            for stage in order
+        }
+
+
+# One per process, like the sheet and fragment caches it reports on.
+timings = StageTimings()
+
+
+def hit_rate(hits, misses):
+    """Share of hits (rounded to 0.1%), or None before the first lookup."""
+    total = hits + misses
+    return round(hits / total, 3) if total else None
+
+
+def log_rerun(stages, **fields):
+    """One JSON line per script run: stage times in ms plus any context ``fields``."""
+    if timings.enabled and logger.isEnabledFor(logging.INFO):
+        record = {"event": "rerun", "ts": round(time.time(), 3), **fields}
+        record["ms"] = {stage: round(seconds * 1e3, 3) for stage, seconds in stages.items()}
+        logger.info(json.dumps(record, default=str, separators=(",", ":")))
@@ -0,0 +1,110 @@
+# exports.py - chunked CSV / XLSX / Parquet exports of a row selection
+import io
+import tempfile
+import threading
+
+import pandas as pd
+
+from preprocess import DATE_COLUMNS
+
+# Rows converted per chunk: the most an export ever holds beyond its output.
+EXPORT_CHUNK_ROWS = 50_000
+
+# An xlsx worksheet holds at most 1,048,576 rows, one of them the header.
+XLSX_MAX_ROWS = 1_048_575
+
+# Exports running at once in this process; further downloads wait for a slot.
+MAX_CONCURRENT_EXPORTS = 2
+_export_slots = threading.BoundedSemaphore(MAX_CONCURRENT_EXPORTS)
+
+FORMATS = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def export_columns(cols):
+    """Table columns as exported: the raw URL in place of the rendered link."""
+    return ["URL" if col == "Link" else col for col in cols]
+
+
+def chunks(df, rows, cols, chunk_rows=EXPORT_CHUNK_ROWS):
+    """``df[cols]`` at positions ``rows``, ``chunk_rows`` rows at a time.
+
+    Values are the stored ones (datetimes, raw URLs, plain text); nothing is
+    formatted for display and the frame itself is never copied whole.
+    """
+    positions = df.columns.get_indexer(cols)
+    for start in range(0, len(rows), chunk_rows):
+        yield df.iloc[rows[start:start + chunk_rows], positions]
+
+
+def csv_chunks(df, rows, cols, chunk_rows=EXPORT_CHUNK_ROWS):
+    """CSV text, header first, one string per chunk; dates as YYYY-MM-DD, blanks empty."""
+    yield pd.DataFrame(columns=cols).to_csv(index=False)
+    for chunk in chunks(df, rows, cols, chunk_rows):
+        yield chunk.to_csv(index=False, header=False, date_format="%Y-%m-%d")
+
+
+def write_csv(df, rows, cols, out, chunk_rows=EXPORT_CHUNK_ROWS):
+    for text in csv_chunks(df, rows, cols, chunk_rows):
+        out.write(text.encode("utf-8"))
+
+
+def write_parquet(df, rows, cols, out, chunk_rows=EXPORT_CHUNK_ROWS):
+    """One Parquet row group per chunk; Categorical columns stay dictionary-encoded strings."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.Schema.from_pandas(df.iloc[:0, df.columns.get_indexer(cols)], preserve_index=False)
+    with pq.ParquetWriter(out, schema) as writer:
+        for chunk in chunks(df, rows, cols, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def write_xlsx(df, rows, cols, out, chunk_rows=EXPORT_CHUNK_ROWS):
+    """openpyxl's write-only mode streams the rows to disk instead of building the sheet in memory."""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+
+    if len(rows) > XLSX_MAX_ROWS:
+        raise ValueError(f"{len(rows):,} rows do not fit in one xlsx sheet ({XLSX_MAX_ROWS:,} max)")
+    book = Workbook(write_only=True)
+    sheet = book.create_sheet("Publications")
+    sheet.append(cols)
+    dates = [col in DATE_COLUMNS for col in cols]
+    for chunk in chunks(df, rows, cols, chunk_rows):
+        columns = [chunk[col].dt.to_pydatetime() if is_date else chunk[col].astype(object)
+                   for col, is_date in zip(cols, dates)]
+        for values in zip(*columns):
+            row = []
+            for value, is_date in zip(values, dates):
+                if pd.isna(value):
+                    value = None
+                elif is_date:
+                    value = WriteOnlyCell(sheet, value)
+                    value.number_format = "yyyy-mm-dd"
+                row.append(value)
+            sheet.append(row)
+    book.save(out)
+
+
+WRITERS = {"csv": write_csv, "xlsx": write_xlsx, "parquet": write_parquet}
+
+
+def export_file(fmt, df, rows, cols, chunk_rows=EXPORT_CHUNK_ROWS):
+    """The export written chunk by chunk to a temporary file, rewound for reading.
+
+    Returns the raw (unbuffered) file, which ``st.download_button`` accepts.
+    It is deleted once closed or garbage collected, so nothing is left on disk
+    after the download has been served.
+    """
+    out = tempfile.TemporaryFile(buffering=0)
+    buffered = io.BufferedWriter(out, buffer_size=1 << 20)
+    with _export_slots:
+        WRITERS[fmt](df, rows, export_columns(cols), buffered, chunk_rows)
+    buffered.flush()
+    buffered.detach()
+    out.seek(0)
+    return out
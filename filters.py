@@ -0,0 +1,46 @@
+# filters.py - precomputed sidebar filter indexes (Sector / Type / Ticker)
+import numpy as np
+
+
+class FilterIndex:
+    """Per-value row positions, built once per snapshot.
+
+    Each filter column must already be ``Categorical``. Selected values of
+    one column are OR-ed together, columns are AND-ed, and no frame is ever
+    copied: the result is a boolean row mask.
+    """
+
+    def __init__(self, df, columns):
+        self.size = len(df)
+        self._codes = {}
+        self._positions = {}
+        self._offsets = {}
+        for col in columns:
+            cat = df[col].cat
+            codes = np.asarray(cat.codes)
+            order = np.argsort(codes, kind="stable")
+            # Missing values have code -1 and sort first; they are never selectable.
+            self._positions[col] = order
+            self._offsets[col] = np.searchsorted(codes[order], np.arange(len(cat.categories) + 1))
+            self._codes[col] = {value: code for code, value in enumerate(cat.categories)}
+
+    def rows(self, col, value):
+        """Row positions holding ``value`` in ``col`` (empty when absent)."""
+        code = self._codes[col].get(value)
+        if code is None:
+            return np.empty(0, dtype=np.intp)
+        offsets = self._offsets[col]
+        return self._positions[col][offsets[code]:offsets[code + 1]]
+
+    def mask(self, selections):
+        """Boolean row mask for ``{column: [values]}``; None when nothing is selected."""
+        mask = None
+        for col, values in selections.items():
+            if not values:
+                continue
+            col_mask = np.zeros(self.size, dtype=bool)
+            for value in values:
+                col_mask[self.rows(col, value)] = True
+            mask = col_mask if mask is None else mask & col_mask
+        return mask
+
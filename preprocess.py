@@ -0,0 +1,87 @@
+# preprocess.py - typed preprocessing of the sheets and display formatting at render time
+import numpy as np
+import pandas as pd
+
+DATE_COLUMNS = ["Approval Date", "Publishing Date"]
+BOLD_COLUMNS = ["Topic", "Title"]
+
+# Storage dtype of free-text columns: one Arrow buffer per column instead of a Python str per cell.
+TEXT_DTYPE = "string[pyarrow]"
+
+DATE_FORMAT = "%b %d, %Y"
+LINK_HTML = '<a href="{url}" target="_blank" style= "text-decoration: none !important;">🔗</a>'
+LINK_MARKDOWN = "[Read here.]({url})"
+MARK_HTML = r"<mark>\g<0></mark>"
+
+# --------------------------------------------
+# PREPROCESSING (once per snapshot)
+# --------------------------------------------
+def prepare(df):
+    """Coerce the date columns to native datetime64; blanks and bad values become NaT.
+
+    Missing values stay missing (no "-" sentinels), so the frame keeps its
+    dtypes and the pending check is a plain ``isna()``.
+    """
+    for col in DATE_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors="coerce")
+    return df
+
+
+def compact(df, categorical=()):
+    """Store the text columns of ``df`` compactly, in place.
+
+    ``categorical`` columns (few distinct values) become ``Categorical`` over
+    Arrow strings, every other text column ``TEXT_DTYPE``. Cells of another
+    type in a text column (a number typed into a title) become their text.
+    """
+    for col in df.columns:
+        dtype = df[col].dtype
+        if dtype == object or isinstance(dtype, pd.StringDtype) or isinstance(dtype, pd.ArrowDtype) and dtype.kind == "U":
+            df[col] = df[col].astype(TEXT_DTYPE)
+        if col in categorical and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = pd.Categorical(df[col])
+    return df
+
+
+# --------------------------------------------
+# DISPLAY FORMATTING (render boundary only)
+# --------------------------------------------
+def format_dates(series, date_format=DATE_FORMAT):
+    # strftime is per-element; publications share few distinct dates, so
+    # format each distinct date once and broadcast the result back.
+    codes, uniques = pd.factorize(series)
+    labels = np.append(np.asarray(uniques.strftime(date_format), dtype=object), "-")
+    return pd.Series(labels[codes], index=series.index)  # NaT has code -1: the trailing "-"
+
+
+def format_links(urls, link_format=LINK_HTML):
+    prefix, suffix = link_format.split("{url}")
+    return (prefix + urls.astype("string") + suffix).fillna("")
+
+
+def format_bold(series):
+    return ("<b>" + series.astype("string") + "</b>").fillna("-")
+
+
+def display_frame(df, cols, date_format=DATE_FORMAT, link_format=LINK_HTML, bold_columns=BOLD_COLUMNS, highlight=None):
+    """Display strings for ``cols`` of ``df``; call on the rows actually shown.
+
+    A "Link" column is built from "URL", ``bold_columns`` are wrapped in
+    ``<b>`` and missing values render as "-". Text matching the
+    ``highlight`` regex (``search.highlight_pattern()``) is wrapped in ``<mark>``.
+    """
+    def mark(text):
+        return text if highlight is None else text.str.replace(highlight, MARK_HTML, regex=True)
+
+    out = {}
+    for col in cols:
+        if col == "Link":
+            out[col] = format_links(df["URL"], link_format)
+        elif col in DATE_COLUMNS:
+            out[col] = mark(format_dates(df[col], date_format))
+        elif col in bold_columns:
+            out[col] = format_bold(mark(df[col].astype("string")))
+        else:
+            out[col] = mark(df[col].astype("string")).fillna("-")
+    return pd.DataFrame(out, index=df.index)
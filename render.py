@@ -0,0 +1,76 @@
+# render.py - paginated HTML rendering of the results tables
+import collections
+import threading
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+def page_count(total, page_size):
+    return max(1, -(-total // page_size))
+
+
+def page_rows(rows, page, page_size):
+    """Row positions shown on 1-based ``page``."""
+    start = (page - 1) * page_size
+    return rows[start:start + page_size]
+
+
+def pending_cards(df, label_cols, detail_label):
+    """Expander titles and detail HTML for one page of pending rows, built column-wise.
+
+    ``df`` holds display strings; ``label_cols`` are the two title columns
+    followed by the headline, detail and date columns.
+    """
+    titles = df[label_cols[0]] + " | " + df[label_cols[1]]
+    bodies = (
+        "<div style='font-family: Lexend; margin-bottom: 12px; margin-top: 12px;'>"
+        "<strong>" + df[label_cols[2]] + "</strong> <br>"
+        + detail_label + ": <strong>" + df[label_cols[3]] + "</strong> <br>"
+        "Publication Date: <strong>" + df[label_cols[4]] + "</strong></div>"
+    )
+    return titles, bodies
+
+
+def table_html(df):
+    """HTML for one page of display strings, wrapped in the scrollable report container."""
+    return "<div class='report-container'>" + df.to_html(index=False, escape=False) + "</div>"
+
+
+class FragmentCache:
+    """Bounded LRU of rendered table fragments, shared by every session.
+
+    Keys should carry the snapshot version plus the normalized filter state,
+    so a new snapshot never serves stale HTML; old entries simply age out.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key, render):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+        # Render outside the lock; two sessions racing on one key just both render it.
+        fragment = render()
+        with self._lock:
+            self._items[key] = fragment
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return fragment
+
+    def __len__(self):
+        return len(self._items)
+
+
+def filter_key(selections, query):
+    """Normalized, hashable filter state: order of picks, case and spacing don't matter."""
+    picks = tuple(sorted((col, tuple(sorted(values))) for col, values in selections.items() if values))
+    return picks, " ".join(query.lower().split()) if query else ""
@@ -0,0 +1,44 @@
+# resources.py - process-wide objects shared by every session (st.cache_resource)
+import streamlit as st
+
+import config
+from approvals import ApprovalStore
+from catalog import build_catalogs, catalog_fingerprint, dump_catalogs, load_catalogs
+from data_source import SheetCache, SnapshotStore, make_source
+from render import FragmentCache
+
+
+@st.cache_resource
+def get_sheet_cache():
+    store = (
+        SnapshotStore(config.CACHE_DIR, dump_catalogs, load_catalogs, fingerprint=catalog_fingerprint())
+        if config.CACHE_DIR else None
+    )
+    cache = SheetCache(make_source(config.DATA_SOURCE, config), build_catalogs, ttl=config.DATA_TTL, store=store)
+    cache.start()
+    return cache
+
+
+def load_data():
+    """Current snapshot; without one (first load failed) the run ends on an error message."""
+    try:
+        return get_sheet_cache().snapshot()
+    except Exception as e:
+        st.error(f"⚠️ The publications could not be loaded ({type(e).__name__}). Please try again in a moment.")
+        st.stop()
+
+
+def stale_note():
+    """Header suffix while an older snapshot is served because the last refresh failed, else ""."""
+    failed_at = get_sheet_cache().failed_at
+    return f" · ⚠️ Stale: refresh failed at {failed_at:%H:%M}" if failed_at else ""
+
+
+@st.cache_resource
+def get_approval_store():
+    return ApprovalStore(config.APPROVALS_DB)
+
+
+@st.cache_resource
+def get_fragment_cache():
+    return FragmentCache(config.FRAGMENT_CACHE_SIZE)
@@ -0,0 +1,87 @@
+# rollups.py - pre-aggregated publication metrics behind the Analytics tab
+import itertools
+
+import numpy as np
+import pandas as pd
+
+# Longest approval lag (days) kept as its own bucket; longer lags share the last one.
+MAX_LAG_DAYS = 30
+
+# Series drawn per chart; smaller groups are summed into "Other".
+TOP_GROUPS = 10
+
+
+class Rollup:
+    """Group-by cube over one sheet's live rows, built once per snapshot.
+
+    For every subset of the filter dimensions it keeps two cuboids:
+    ``months`` (per month of Publishing Date: publications, pending ones and
+    the summed approval lag) and ``lags`` (publications per lag in days).
+    A query reads the smallest cuboid covering its filters and breakdown,
+    so a filter change slices a few hundred pre-summed rows instead of
+    regrouping the sheet.
+    """
+
+    MEASURES = ["published", "pending", "lag_days", "lag_n"]
+
+    def __init__(self, df, dims):
+        self.dims = list(dims)
+        published = df["Publishing Date"]
+        lag = (published - df["Approval Date"]).dt.days
+        rows = pd.DataFrame({
+            "month": published.to_numpy().astype("datetime64[M]"),
+            **{dim: df[dim] for dim in self.dims},
+            "published": 1,
+            "pending": df["Approval Date"].isna().astype(int),
+            "lag_days": lag.fillna(0),
+            "lag_n": lag.notna().astype(int),
+            "lag": lag.clip(lower=0, upper=MAX_LAG_DAYS),
+        })
+        rows = rows[rows["month"].notna()]
+        finest = tuple(self.dims)
+        self.months = {finest: rows.groupby(["month", *finest], observed=True)[self.MEASURES].sum().reset_index()}
+        self.lags = {finest: rows[rows["lag"].notna()].groupby(["lag", *finest], observed=True)["published"].sum().reset_index()}
+        # Coarser cuboids roll up from the finest one, never from the rows.
+        for size in range(len(finest)):
+            for subset in itertools.combinations(finest, size):
+                self.months[subset] = (
+                    self.months[finest].groupby(["month", *subset], observed=True)[self.MEASURES].sum().reset_index()
+                )
+                self.lags[subset] = self.lags[finest].groupby(["lag", *subset], observed=True)["published"].sum().reset_index()
+
+    @staticmethod
+    def _slice(cuboids, selections, by=None):
+        """Rows of the smallest cuboid holding every selected column (and ``by``), filtered."""
+        needed = {col for col, values in selections.items() if values} | ({by} if by else set())
+        cube = min((cube for dims, cube in cuboids.items() if needed <= set(dims)), key=len)
+        mask = np.ones(len(cube), dtype=bool)
+        for col, values in selections.items():
+            if values:
+                mask &= cube[col].isin(values).to_numpy()
+        return cube[mask]
+
+    def over_time(self, selections, by, value="published", top=TOP_GROUPS):
+        """Month x group table of ``value`` ("published" or "pending") for the selected slice."""
+        cube = self._slice(self.months, selections, by)
+        cube = cube[cube[value] > 0]
+        leaders = cube.groupby(by, observed=True)[value].sum().nlargest(top).index
+        inside = cube[by].isin(leaders).to_numpy()
+        table = cube[inside].groupby(["month", by], observed=True)[value].sum().unstack(fill_value=0)
+        table = table.reindex(columns=leaders).rename(columns=str)
+        if not inside.all():
+            other = cube[~inside].groupby("month")[value].sum()
+            table = table.reindex(table.index.union(other.index), fill_value=0)
+            table["Other"] = other.reindex(table.index, fill_value=0)
+        return table
+
+    def lag_summary(self, selections):
+        """``(days, publications)`` histogram and the mean approval lag of the slice (None if empty)."""
+        lags = self._slice(self.lags, selections).groupby("lag")["published"].sum()
+        months = self._slice(self.months, selections)
+        n = months["lag_n"].sum()
+        return lags, months["lag_days"].sum() / n if n else None
+
+    def totals(self, selections):
+        """Publications and pending publications in the slice."""
+        months = self._slice(self.months, selections)
+        return int(months["published"].sum()), int(months["pending"].sum())
@@ -0,0 +1,149 @@
+# schema.py - declarative column schema of each sheet: typing at parse time plus one-pass validation
+import collections
+import logging
+
+import numpy as np
+import pandas as pd
+
+from preprocess import TEXT_DTYPE
+
+logger = logging.getLogger(__name__)
+
+# kind: "text", "url" (text holding an http(s) link) or "date";
+# required: a blank cell makes the row bad (the sidebar filters need a value).
+Field = collections.namedtuple("Field", ["kind", "required"], defaults=[False])
+
+# Columns the dashboards read from each sheet, by their live names; everything
+# else is skipped at parse time. Every column must be present.
+SCHEMAS = {
+    "main": {
+        "URL": Field("url"),
+        "Sector": Field("text", required=True),
+        "Type": Field("text", required=True),
+        "Approval Date": Field("date"),
+        "Publishing Date": Field("date"),
+        "Topic": Field("text"),
+        "Alpha Idea": Field("text"),
+    },
+    "comp": {
+        "URL": Field("url"),
+        "Ticker": Field("text", required=True),
+        "Type": Field("text", required=True),
+        "Approval Date": Field("date"),
+        "Publishing Date": Field("date"),
+        "Banner": Field("text"),
+        "Title": Field("text"),
+    },
+}
+
+# Cells treated as blank: empty, whitespace only, or the "-" placeholder.
+BLANK_PATTERN = r"^\s*-?\s*$"
+URL_PATTERN = r"^https?://\S+$"
+
+# A sheet with more bad rows than this share is rejected as a whole: more
+# likely a broken export or shifted columns than a few typos.
+MAX_BAD_SHARE = 0.05
+
+# Bad cells quoted in a log line or a rejection message.
+REPORT_ROWS = 10
+
+
+class SchemaError(ValueError):
+    """A sheet does not fit its schema; the snapshot it would have replaced is kept."""
+
+
+def _text(values):
+    """Cells as ``TEXT_DTYPE`` with blanks missing; numbers become their text ("12", not "12.0")."""
+    values = pd.Series(values, dtype=object) if not isinstance(values, pd.Series) else values
+    if pd.api.types.infer_dtype(values, skipna=True) not in ("string", "empty"):
+        # A number typed into a text column; rare, so per cell is fine.
+        values = values.map(lambda v: str(int(v)) if isinstance(v, float) and v.is_integer() else v, na_action="ignore")
+        values = values.where(values.isna(), values.astype(str))
+    text = values.astype(TEXT_DTYPE)
+    return text.mask(text.str.match(BLANK_PATTERN).fillna(True).astype(bool))
+
+
+def _dates(values):
+    """``(datetime64 column, mask of non-blank cells that are not dates)``.
+
+    Date cells arrive as dates; text is parsed; numbers are never dates (an
+    Excel serial whose cell lost its date format) and are reported as bad.
+    """
+    values = pd.Series(values, dtype=object) if not isinstance(values, pd.Series) else values
+    if pd.api.types.is_datetime64_dtype(values) or pd.api.types.infer_dtype(values, skipna=True) in ("date", "datetime", "empty"):
+        # Dates and blanks only, the usual case: nothing to check cell by cell.
+        return pd.to_datetime(values).astype("datetime64[us]"), np.zeros(len(values), dtype=bool)
+    cells = values.to_numpy()
+    text = np.frompyfunc(lambda v: isinstance(v, str), 1, 1)(cells).astype(bool)
+    numeric = np.frompyfunc(lambda v: isinstance(v, (int, float)) and v == v, 1, 1)(cells).astype(bool)
+    blank = np.array(values.isna())
+    blank[text] = values[text].astype("string").str.match(BLANK_PATTERN).to_numpy(dtype=bool)
+    parsed = pd.to_datetime(values.where(~(blank | numeric)), errors="coerce", format="mixed")
+    return parsed.astype("datetime64[us]"), ~blank & (numeric | parsed.isna().to_numpy())
+
+
+def check_sheet(name, df, first_row=2):
+    """Type ``df`` by ``SCHEMAS[name]`` in one pass; returns ``(typed frame, issues)``.
+
+    ``issues`` has one line per bad cell (sheet ``row``, ``column``,
+    ``problem``, raw ``value``); bad cells are left blank in the typed frame.
+    ``first_row`` is the sheet row of the frame's first index label.
+    Raises ``SchemaError`` when a column is missing or there are no rows.
+    """
+    schema = SCHEMAS[name]
+    missing = [col for col in schema if col not in df.columns]
+    if missing:
+        raise SchemaError(f"{name} sheet: missing column(s) {', '.join(map(repr, missing))}")
+    if not len(df):
+        raise SchemaError(f"{name} sheet: no rows")
+    rows = np.asarray(df.index) + first_row
+    typed, issues = {}, []
+    for col, field in schema.items():
+        if field.kind == "date":
+            typed[col], bad = _dates(df[col])
+            problem = "not a date"
+        else:
+            typed[col] = _text(df[col])
+            bad = np.zeros(len(df), dtype=bool)
+            if field.kind == "url":
+                bad = (typed[col].notna() & ~typed[col].str.match(URL_PATTERN).fillna(False)).to_numpy(dtype=bool)
+                problem = "not a URL"
+            typed[col] = typed[col].mask(bad)
+        if bad.any():
+            issues.append(pd.DataFrame({"row": rows[bad], "column": col, "problem": problem, "value": df[col][bad].astype(str).to_numpy()}))
+        if field.required:
+            blank = typed[col].isna().to_numpy() & ~bad
+            if blank.any():
+                issues.append(pd.DataFrame({"row": rows[blank], "column": col, "problem": "blank", "value": ""}))
+    issues = pd.concat(issues, ignore_index=True).sort_values(["row", "column"], ignore_index=True) if issues else (
+        pd.DataFrame(columns=["row", "column", "problem", "value"])
+    )
+    return pd.DataFrame(typed, index=df.index), issues
+
+
+def summarize(issues, limit=REPORT_ROWS):
+    """The first ``limit`` issues on one line, e.g. "row 7 Approval Date: not a date ('tbd')"."""
+    quoted = [
+        f"row {row} {column}: {problem}" + (f" ({value!r})" if value else "")
+        for row, column, problem, value in issues.head(limit).itertuples(index=False)
+    ]
+    more = len(issues) - limit
+    return "; ".join(quoted) + (f"; … {more} more" if more > 0 else "")
+
+
+def conform(frames, first_row=2):
+    """Type and validate every sheet of ``frames``, or raise ``SchemaError`` for the first bad one.
+
+    Bad rows are kept (their bad cells blank) and logged, unless they exceed
+    ``MAX_BAD_SHARE`` of a sheet: then the whole sheet is rejected.
+    """
+    typed = {}
+    for name, df in frames.items():
+        typed[name], issues = check_sheet(name, df, first_row)
+        if issues.empty:
+            continue
+        bad_rows = issues["row"].nunique()
+        if bad_rows > MAX_BAD_SHARE * len(df):
+            raise SchemaError(f"{name} sheet: {bad_rows} of {len(df)} rows are bad: {summarize(issues)}")
+        logger.warning("%s sheet: %d bad row(s) kept with their bad cells blank: %s", name, bad_rows, summarize(issues))
+    return typed
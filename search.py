@@ -0,0 +1,199 @@
+# search.py - full-text search over the visible text of a sheet: matching, BM25 ranking, highlighting
+import collections
+import math
+import re
+
+import numpy as np
+import pandas as pd
+
+TOKEN_PATTERN = r"\w+"
+
+# Joins the fields of a row's search text; a phrase never spans it, so
+# Type "Thematic" followed by a Topic "Nuclear ..." is no "thematic nuclear".
+FIELD_SEPARATOR = "\x1f"
+
+# A query is bare words, "quoted phrases" or both; every clause must match.
+# Bare words prefix-match ("nuc" finds "nuclear"); phrase words match whole
+# words in that order, the last one as a prefix when followed by "*" or while
+# the closing quote is still being typed.
+CLAUSE_PATTERN = r'"([^"]*)("\*?)?|([^\s"]+)'
+
+Clause = collections.namedtuple("Clause", ["words", "prefix"])
+
+# BM25 term-frequency saturation and document-length normalization.
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def parse_query(query):
+    """The ``Clause``s of ``query``: one per bare word, one per quoted phrase."""
+    clauses = []
+    for phrase, closing, bare in re.findall(CLAUSE_PATTERN, query.lower()):
+        if bare:
+            clauses.extend(Clause((word,), True) for word in re.findall(TOKEN_PATTERN, bare))
+            continue
+        words = tuple(re.findall(TOKEN_PATTERN, phrase))
+        if words:
+            clauses.append(Clause(words, closing != '"' or phrase.rstrip().endswith("*")))
+    return clauses
+
+
+def normalize_query(query):
+    """The query's clauses, lowercased and single-spaced: what the index actually matches.
+
+    A phrase that is a single prefix word is just that word: '"nuc"*' is "nuc".
+    """
+    return " ".join(
+        clause.words[0] if len(clause.words) == 1 and clause.prefix
+        else '"' + " ".join(clause.words) + ('"*' if clause.prefix else '"')
+        for clause in parse_query(query)
+    )
+
+
+def extra_terms(query, base):
+    """Terms of ``query`` not already in ``base`` when ``query`` extends ``base``, else None.
+
+    Typing on ("nuclear" -> "nuclear ener") can only narrow the matches, so
+    ``base``'s result AND the extra terms' result is ``query``'s result.
+    Phrases are left out: a phrase typed on can match rows the shorter one
+    did not ('"energy s"' -> '"energy"'), so those queries are searched afresh.
+    """
+    query, base = normalize_query(query), normalize_query(base)
+    if not base or not query.startswith(base) or '"' in query:
+        return None
+    known = set(base.split())
+    return " ".join(term for term in query.split() if term not in known)
+
+
+def clause_pattern(clause):
+    """Regex of the text ``clause`` matches: its words in order, within one field."""
+    words, prefix = clause
+    between = r"[^\w" + FIELD_SEPARATOR + "]+"
+    return r"\b" + between.join(map(re.escape, words)) + (r"\w*" if prefix else r"\b")
+
+
+def highlight_pattern(query):
+    """Regex of the text ``query`` matches, to highlight; None for an empty query."""
+    clauses = parse_query(query)
+    if not clauses:
+        return None
+    return re.compile("|".join(sorted(map(clause_pattern, clauses), key=len, reverse=True)), re.IGNORECASE)
+
+
+def bm25(tf, df, n, lengths, avg_length):
+    """BM25 weight of one term: ``tf`` occurrences in rows of ``lengths`` tokens; ``df`` of ``n`` rows hold it."""
+    idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+    # In place: each temporary of a million-row query is a fresh allocation.
+    norm = lengths * np.float32(BM25_K1 * BM25_B / avg_length)
+    norm += np.float32(BM25_K1 * (1 - BM25_B))
+    norm += tf
+    weight = tf * np.float32(idf * (BM25_K1 + 1))
+    weight /= norm
+    return weight
+
+
+def _postings(codes, rows, count):
+    """``(offsets, rows, counts)`` of token occurrences: rows per term code, each once with its count."""
+    order = np.lexsort((rows, codes))
+    codes, rows = codes[order], rows[order]
+    first = np.ones(len(rows), dtype=bool)
+    first[1:] = (codes[1:] != codes[:-1]) | (rows[1:] != rows[:-1])
+    starts = np.flatnonzero(first)
+    counts = np.diff(np.append(starts, len(rows)))
+    offsets = np.searchsorted(codes[starts], np.arange(count + 1))
+    return offsets, rows[starts].astype(np.int32), np.minimum(counts, np.iinfo(np.uint16).max).astype(np.uint16)
+
+
+class SearchIndex:
+    """Token inverted index with prefix matching and phrases, built once per snapshot.
+
+    ``text`` holds the visible text of each row (no markup). Every token of a
+    query must prefix-match some token of a row: "nuc energ" finds "advanced
+    nuclear energy". Postings are stored term-sorted in one array, so all the
+    terms sharing a prefix are a single contiguous slice; each posting keeps
+    how often its row holds the term, and ``lengths`` the tokens per row, for
+    BM25. Adjacent token pairs of one field get postings of their own,
+    keyed ``code * len(vocab) + next code``, so a phrase is a lookup rather
+    than a scan of the text: "energy storage" needs the pair (energy,
+    storage). A longer phrase needs each of its pairs, which rows can also
+    hold apart; ``Catalog.search_mask()`` checks those in the text.
+    """
+
+    def __init__(self, text):
+        self.size = len(text)
+        tokens = text.str.lower().str.findall(TOKEN_PATTERN + "|" + FIELD_SEPARATOR).explode().dropna()
+        boundary = (tokens == FIELD_SEPARATOR).to_numpy()
+        rows = np.asarray(tokens.index, dtype=np.int64)
+        codes, vocab = pd.factorize(tokens[~boundary], sort=True)
+        self.vocab = np.asarray(vocab, dtype=object)
+        words = rows[~boundary]
+        self.lengths = np.minimum(np.bincount(words, minlength=self.size), np.iinfo(np.uint16).max).astype(np.uint16)
+        self.offsets, self.postings, self.counts = _postings(codes, words, len(self.vocab))
+        # Tokens come in text order, so a pair is a token and the next one in the same row and field.
+        stream = np.full(len(tokens), -1, dtype=np.int64)
+        stream[~boundary] = codes
+        same = (rows[1:] == rows[:-1]) & (stream[1:] >= 0) & (stream[:-1] >= 0)
+        pairs = stream[:-1][same] * len(self.vocab) + stream[1:][same]
+        self.pairs, pair_codes = np.unique(pairs, return_inverse=True)
+        self.pair_offsets, self.pair_postings, self.pair_counts = _postings(pair_codes, rows[:-1][same], len(self.pairs))
+
+    @classmethod
+    def from_arrays(cls, size, **arrays):
+        """The index of ``size`` rows whose arrays (``vocab``, ``postings``, ``pairs``, ...) are given, as persisted."""
+        index = cls.__new__(cls)
+        index.size = size
+        index.__dict__.update(arrays)
+        return index
+
+    def _range(self, word, prefix):
+        """Codes ``[lo, hi)`` of the terms ``word`` matches: those it starts, or itself only."""
+        lo = np.searchsorted(self.vocab, word, side="left")
+        if prefix:
+            return lo, np.searchsorted(self.vocab, word + "\U0010ffff", side="left")
+        return lo, np.searchsorted(self.vocab, word, side="right")
+
+    def spans(self, clauses):
+        """``(rows, counts)`` postings of each unit a matching row holds: a word, or a pair of a phrase.
+
+        Always ``sum(max(1, len(words) - 1))`` spans, empty where nothing
+        matches, so the spans of different segments line up.
+        """
+        spans = []
+        for words, prefix in clauses:
+            ranges = [self._range(word, prefix and i == len(words) - 1) for i, word in enumerate(words)]
+            if len(words) == 1:
+                lo, hi = ranges[0]
+                start, end = self.offsets[lo], self.offsets[hi]
+                spans.append((self.postings[start:end], self.counts[start:end]))
+                continue
+            for (a, a_end), (lo, hi) in zip(ranges, ranges[1:]):
+                start = end = 0
+                if a < a_end and lo < hi:
+                    key = a * len(self.vocab)
+                    first, last = np.searchsorted(self.pairs, [key + lo, key + hi], side="left")
+                    start, end = self.pair_offsets[first], self.pair_offsets[last]
+                spans.append((self.pair_postings[start:end], self.pair_counts[start:end]))
+        return spans
+
+    def term_counts(self, span):
+        """``(occurrences per row, rows holding any)`` of one of ``spans()``."""
+        rows, counts = span
+        if np.all(rows[1:] > rows[:-1]):
+            # A single term (or none): each row appears once, no summing needed.
+            counted = np.zeros(self.size, dtype=np.uint16)
+            counted[rows] = counts
+            return counted, len(rows)
+        counted = np.bincount(rows, weights=counts, minlength=self.size).astype(np.float32)
+        return counted, np.count_nonzero(counted)
+
+    def mask(self, query):
+        """Boolean row mask of rows matching every clause of ``query``; None for an empty query."""
+        clauses = parse_query(query)
+        if not clauses:
+            return None
+        mask = None
+        for rows, _ in self.spans(clauses):
+            part = np.zeros(self.size, dtype=bool)
+            part[rows] = True
+            mask = part if mask is None else np.logical_and(mask, part, out=mask)
+        return mask
@@ -0,0 +1,251 @@
+# views.py - the dashboard_new.py tabs; a rerun only calls the active tab's view
+import collections
+import functools
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import config
+from approvals import pending_with_decisions
+from catalog import TABLE_COLUMNS
+from components import pager
+from diagnostics import hit_rate, log_rerun, timings
+from exports import FORMATS, XLSX_MAX_ROWS, export_file
+from preprocess import display_frame
+from render import filter_key, page_rows, pending_cards, table_html
+from resources import get_approval_store, get_fragment_cache, get_sheet_cache
+from search import extra_terms, highlight_pattern, normalize_query
+
+# Static stylesheet, read once per process instead of being rebuilt by every rerun.
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "dashboard.css")) as f:
+    STYLE = f"<style>\n{f.read()}</style>"
+
+
+# --------------------------------------------
+# FILTER + SEARCH LOGIC
+# --------------------------------------------
+def _keep(mask):
+    """``mask`` as little per-session state: its slots (int32) when few are set, else packed bits."""
+    slots = np.flatnonzero(mask)
+    return slots.astype(np.int32) if slots.size * 32 < mask.size else np.packbits(mask)
+
+
+def _expand(kept, size):
+    """The slot mask ``_keep`` stored as ``kept``."""
+    if kept.dtype == np.uint8:
+        return np.unpackbits(kept, count=size).view(bool)
+    mask = np.zeros(size, dtype=bool)
+    mask[kept] = True
+    return mask
+
+
+def search_mask(catalog, query, version):
+    """Slot mask for ``query``, reusing this session's recent results.
+
+    Results are kept under (snapshot version, sheet, normalized query). An
+    exact repeat costs nothing. A query extending a kept one ("nuclear" ->
+    "nuclear ener") matches a subset of it, so only the terms the kept query
+    doesn't already hold are searched and intersected with its mask.
+
+    Every session holds its own results while the snapshot is shared, so they
+    are kept compact (see ``_keep``), a few KiB instead of a byte per row.
+    """
+    terms = normalize_query(query) if query else ""
+    if not terms:
+        return None
+    recent = st.session_state.setdefault("recent_searches", collections.OrderedDict())
+    key = (version, catalog.name, terms)
+    if key in recent:
+        recent.move_to_end(key)
+        return _expand(recent[key], len(catalog.df))
+    narrowing = {
+        q: extra for v, name, q in recent
+        if v == version and name == catalog.name and (extra := extra_terms(terms, q)) is not None
+    }
+    if not narrowing:
+        mask = catalog.search_mask(terms)
+    else:
+        base = max(narrowing, key=len)
+        mask = _expand(recent[(version, catalog.name, base)], len(catalog.df))
+        mask = mask & catalog.search_mask(narrowing[base]) if narrowing[base] else mask
+    recent[key] = _keep(mask)
+    while len(recent) > config.SEARCH_CACHE_SIZE:
+        recent.popitem(last=False)
+    return mask
+
+
+def filter_df(catalog, selections, query, version, stage_times):
+    """Live slots matching the filters and the search, in sheet order: ``show_table`` ranks them."""
+    with timings.timed("filter", stage_times):
+        mask = catalog.filter_mask(selections)
+    with timings.timed("search", stage_times):
+        return catalog.rows(mask, search_mask(catalog, query, version))
+
+
+def _export_file(fmt, catalog, rows, query, cols):
+    """``export_file`` of ``rows`` ranked for ``query``; run when a download is clicked."""
+    return export_file(fmt, catalog.df, catalog.rank(rows, query), cols)
+
+
+def export_buttons(key, catalog, rows, query):
+    """One download per format of exactly the filtered rows, best match first.
+
+    The file is only written when a button is clicked, off the script thread
+    (``data`` is a callable), chunk by chunk from ``rows``; only then are all
+    of them ranked.
+    """
+    for col, fmt in zip(st.columns(len(FORMATS)), FORMATS):
+        too_big = fmt == "xlsx" and len(rows) > XLSX_MAX_ROWS
+        col.download_button(
+            f"⬇️ {fmt.upper()}", functools.partial(_export_file, fmt, catalog, rows, query, TABLE_COLUMNS[key]),
+            file_name=f"{key}_publications.{fmt}", mime=FORMATS[fmt], key=f"{key}_export_{fmt}",
+            on_click="ignore", disabled=too_big or not len(rows),
+            help=f"Over {XLSX_MAX_ROWS:,} rows: narrow the filters or use CSV / Parquet" if too_big else None,
+        )
+
+
+def show_table(key, catalog, rows, selections, query, version, stage_times):
+    state = filter_key(selections, query)
+    page, page_size = pager(key, len(rows), state)
+    with timings.timed("search", stage_times):
+        # Only the rows up to this page need their rank; the rest are never shown.
+        shown = page_rows(catalog.rank(rows, query, limit=page * page_size), page, page_size)
+    with timings.timed("render", stage_times):
+        html = get_fragment_cache().get_or_render(
+            (version, key, state, page, page_size),
+            lambda: table_html(display_frame(
+                catalog.df.iloc[shown], TABLE_COLUMNS[key], highlight=highlight_pattern(query),
+            )),
+        )
+    st.markdown(html, unsafe_allow_html=True)
+
+
+# --------------------------------------------
+# TABS
+# --------------------------------------------
+def progressive_tab(catalogs, selections, query, version, stage_times):
+    st.markdown("<div class='subheader-container'>Intro-act: Progressive Industry Research</div>", unsafe_allow_html=True)
+    filtered = filter_df(catalogs["main"], selections, query, version, stage_times)
+    st.markdown(f"<p style= 'font-family: Lexend;'>✅ Found {len(filtered)} publications...</p>", unsafe_allow_html=True)
+    export_buttons("main", catalogs["main"], filtered, query)
+    show_table("main", catalogs["main"], filtered, selections, query, version, stage_times)
+
+
+def partnercap_tab(catalogs, selections, query, version, stage_times):
+    st.markdown("<div class='subheader-container'>PartnerCap Securities: Sell-Side Equity Research</div>", unsafe_allow_html=True)
+    filtered = filter_df(catalogs["comp"], selections, query, version, stage_times)
+    st.markdown(f"<p style= 'font-family: Lexend;'>✅ Found {len(filtered)} reports...</p>", unsafe_allow_html=True)
+    export_buttons("comp", catalogs["comp"], filtered, query)
+    show_table("comp", catalogs["comp"], filtered, selections, query, version, stage_times)
+
+
+def approval_view(key, catalog, label_cols, detail_label, stage_times):
+    with timings.timed("filter", stage_times):
+        pending = pending_with_decisions(catalog.df.iloc[catalog.pending], get_approval_store().latest(key))
+    if pending.empty:
+        st.info("No pending pieces.")
+        return
+
+    # Only the chosen group's current page is materialized as expanders.
+    group_col = label_cols[0]
+    counts = pending[group_col].value_counts()
+    counts = counts[counts > 0].sort_index()
+    group = st.selectbox(
+        f"Pending by {group_col}", ["All"] + list(counts.index), key=f"{key}_pending_group",
+        format_func=lambda g: f"All ({len(pending)})" if g == "All" else f"{g} ({counts[g]})",
+    )
+    if group != "All":
+        pending = pending[pending[group_col] == group]
+
+    page, page_size = pager(f"{key}_pending", len(pending), group)
+    shown = pending.iloc[(page - 1) * page_size:page * page_size]
+    with timings.timed("render", stage_times):
+        titles, bodies = pending_cards(display_frame(shown, label_cols), label_cols, detail_label)
+
+    for pub_id, action, decided_at, title, body in zip(shown["Publication ID"], shown["action"], shown["decided_at"], titles, bodies):
+        with st.expander(title):
+            st.markdown(body, unsafe_allow_html=True)
+            if action == "pause":
+                st.markdown(f"<div style= 'font-family: Lexend;'>⏸️ Distribution paused on {decided_at.strftime('%b %d, %Y')}</div>", unsafe_allow_html=True)
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button(f"✅ Approve for distribution", key=f"{key}_approve_{pub_id}"):
+                    approved_at = get_approval_store().record(key, pub_id, "approve")
+                    st.success(f"Approved on {approved_at.strftime('%b %d, %Y')}")
+            with col2:
+                if st.button(f"❌ Suggest Edits/Pause for Distribution", key=f"{key}_pause_{pub_id}"):
+                    paused_at = get_approval_store().record(key, pub_id, "pause")
+                    st.success(f"Edits suggested on {paused_at.strftime('%b %d, %Y')} and distribution paused until further review.")
+
+
+def pending_tab(catalogs, stage_times):
+    st.markdown("<div class='subheader-container'>🕒 Pending Progressive Industry Research Publications</div>", unsafe_allow_html=True)
+    approval_view("main", catalogs["main"], ['Sector', 'Type', 'Topic', 'Alpha Idea', 'Publishing Date'], "Company Spotlights", stage_times)
+    st.markdown("<div class='subheader-container'>🕒 Pending Equity Research Publications</div>", unsafe_allow_html=True)
+    approval_view("comp", catalogs["comp"], ['Ticker', 'Type', 'Title', 'Banner', 'Publishing Date'], "Banner", stage_times)
+
+
+def bar_chart(table, title, x_label, y_label):
+    """Stacked bars, one trace per column of ``table`` (graph_objects: ~10x cheaper to build than plotly.express)."""
+    import plotly.graph_objects as go  # only paid for once someone opens the charts
+
+    figure = go.Figure([go.Bar(x=table.index, y=table[col].to_numpy(), name=str(col)) for col in table.columns])
+    figure.update_layout(
+        title=title, barmode="stack", font_family="Lexend", margin=dict(t=50, b=10),
+        xaxis_title=x_label, yaxis_title=y_label, showlegend=len(table.columns) > 1,
+    )
+    return figure
+
+
+def analytics_tab(catalog, selections, stage_times):
+    st.markdown("<div class='subheader-container'>📈 Publication Analytics</div>", unsafe_allow_html=True)
+    with timings.timed("preprocess", stage_times):
+        rollup = catalog.rollup
+    by = st.selectbox("Break down by", rollup.dims, key=f"analytics_{catalog.name}_by")
+
+    with timings.timed("filter", stage_times):
+        published, pending = rollup.totals(selections)
+        per_month = rollup.over_time(selections, by)
+        backlog = rollup.over_time(selections, by, value="pending")
+        lags, mean_lag = rollup.lag_summary(selections)
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Publications", f"{published:,}")
+    col2.metric("Pending approval", f"{pending:,}")
+    col3.metric("Mean approval lag", "-" if mean_lag is None else f"{mean_lag:.1f} days")
+
+    with timings.timed("render", stage_times):
+        charts = [
+            bar_chart(per_month, f"Publications per month by {by}", "Publishing month", "Publications"),
+            bar_chart(backlog, f"Pending backlog by publishing month and {by}", "Publishing month", "Pending"),
+            bar_chart(lags.to_frame(), "Approval lag (Publishing minus Approval Date)", "Days", "Publications"),
+        ]
+    for chart in charts:
+        st.plotly_chart(chart)
+
+
+# --------------------------------------------
+# DIAGNOSTICS (DASHBOARD_DIAGNOSTICS=1)
+# --------------------------------------------
+def diagnostics_panel(version, tab, query, stage_times):
+    sheet_cache, fragment_cache = get_sheet_cache(), get_fragment_cache()
+    rates = {
+        "sheet_cache": hit_rate(sheet_cache.hits, sheet_cache.misses),
+        "fragment_cache": hit_rate(fragment_cache.hits, fragment_cache.misses),
+    }
+    log_rerun(stage_times, tab=tab, version=version, query=bool(query), hit_rate=rates)
+
+    with st.sidebar.expander("🩺 Diagnostics"):
+        summary = timings.summary()
+        st.dataframe(
+            pd.DataFrame(
+                [(stage, runs, p50, p95) for stage, (runs, p50, p95) in summary.items()],
+                columns=["Stage", "Runs", "p50 ms", "p95 ms"],
+            ).round(2),
+            hide_index=True,
+        )
+        for name, rate in rates.items():
+            st.caption(f"{name.replace('_', ' ').capitalize()} hit rate: " + ("-" if rate is None else f"{rate:.0%}"))
+        st.caption(f"Snapshot v{version}, {len(fragment_cache)} cached table pages")